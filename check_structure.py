@@ -18,33 +18,36 @@ except ImportError:
 
 def run_check():
     """Ejecuta la validación y muestra un reporte claro."""
-    print("=" * 60)
-    print("🔍 VERIFICADOR DE ESTRUCTURA PARA REPORTEADOR")
-    print("=" * 60)
-    print(f"Directorio actual: {os.getcwd()}\n")
+    out = [
+        "=" * 60,
+        "🔍 VERIFICADOR DE ESTRUCTURA PARA REPORTEADOR",
+        "=" * 60,
+        f"Directorio actual: {os.getcwd()}\n",
+    ]
 
     is_valid, report = validate_project_structure()
 
     if report['created']:
-        print("🛠️  Elementos creados automáticamente:")
-        for item in report['created']:
-            print(f"  [+] {item}")
-        print("-" * 30)
+        out.append("🛠️  Elementos creados automáticamente:")
+        out.extend(f"  [+] {item}" for item in report['created'])
+        out.append("-" * 30)
 
     if is_valid:
-        print("✅ ¡ÉXITO! La estructura del proyecto es correcta.")
-        print("   La aplicación debería funcionar sin problemas.")
+        out.append("✅ ¡ÉXITO! La estructura del proyecto es correcta.")
+        out.append("   La aplicación debería funcionar sin problemas.")
     else:
-        print("❌ ¡ERROR CRÍTICO! Faltan archivos o carpetas indispensables.")
-        print("   La aplicación NO podrá iniciarse correctamente.")
-        print("\n   Por favor, asegúrate de que los siguientes elementos existan:")
+        out.append("❌ ¡ERROR CRÍTICO! Faltan archivos o carpetas indispensables.")
+        out.append("   La aplicación NO podrá iniciarse correctamente.")
+        out.append("\n   Por favor, asegúrate de que los siguientes elementos existan:")
         for error in report['errors']:
             item_name = error.split("'")[1] if "'" in error else error
-            print(f"   - {item_name}")
+            out.append(f"   - {item_name}")
         
-        print("\n   La aplicación se cerrará si no se resuelven estos problemas.")
+        out.append("\n   La aplicación se cerrará si no se resuelven estos problemas.")
 
-    print("\n" + "=" * 60)
+    out.append("\n" + "=" * 60)
+    # Un único write en lugar de un print por línea
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     run_check() 
\ No newline at end of file
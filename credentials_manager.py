@@ -1,64 +1,124 @@
 import json
 import base64
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 import sys
 
 from utils_logging import logger
 
+try:
+    import orjson
 
+    def _loads(raw: bytes):
+        return orjson.loads(raw)
+
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:  # orjson es opcional; se usa json de la librería estándar
+    def _loads(raw: bytes):
+        return json.loads(raw)
+
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+
+# Directorio base resuelto una sola vez al importar el módulo:
+# - En modo script usa la carpeta del módulo.
+# - En ejecutable (PyInstaller) utiliza el directorio donde vive el .exe.
+_BASE_DIR = (Path(sys.executable) if getattr(sys, "frozen", False) else Path(__file__)).resolve().parent
+
+
+@lru_cache(maxsize=None)
 def _resolve_storage_path(config_file: str) -> Path:
-    """
-    Determina una ruta estable para guardar credenciales.
-    - En modo script usa la carpeta del módulo.
-    - En ejecutable (PyInstaller) utiliza el directorio donde vive el .exe.
-    """
-    if getattr(sys, "frozen", False):
-        base_dir = Path(sys.executable).resolve().parent
-    else:
-        base_dir = Path(__file__).resolve().parent
-    return base_dir / config_file
+    """Determina una ruta estable para guardar credenciales."""
+    return _BASE_DIR / config_file
 
 
 class CredentialsManager:
     """Helper que persiste credenciales NTLM en disco."""
 
+    # Caché a nivel de proceso: ruta -> (st_mtime_ns, st_size, credenciales)
+    _CACHE: Dict[Path, Tuple[int, int, dict]] = {}
+
     def __init__(self, config_file: str = "credentials.json") -> None:
         self.config_path = _resolve_storage_path(config_file)
-        self.credentials: dict = {}
-        self._load_credentials()
+        self._credentials: Optional[dict] = None
+
+    @property
+    def credentials(self) -> dict:
+        """Credenciales en memoria; se cargan desde disco en el primer acceso."""
+        if self._credentials is None:
+            self._load_credentials()
+        return self._credentials
+
+    @credentials.setter
+    def credentials(self, value: dict) -> None:
+        self._credentials = value
 
     def _write_credentials(self, data: dict) -> None:
-        """Guarda las credenciales en formato JSON."""
+        """Guarda las credenciales en formato JSON de forma atómica (tmp + os.replace)."""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
-        self.config_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp_path = self.config_path.with_suffix(self.config_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(_dumps(data))
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.config_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _cache_store(self) -> None:
+        """Registra las credenciales actuales en la caché según el stat del archivo."""
+        try:
+            st = self.config_path.stat()
+        except OSError:
+            self._CACHE.pop(self.config_path, None)
+            return
+        self._CACHE[self.config_path] = (st.st_mtime_ns, st.st_size, self._credentials)
 
     def _load_credentials(self) -> None:
         """Carga credenciales desde disco (soporta formato legacy base64)."""
-        if not self.config_path.exists():
+        try:
+            st = self.config_path.stat()
+        except FileNotFoundError:
             logger.info("Archivo de credenciales no encontrado, se inicia vacío")
+            self._CACHE.pop(self.config_path, None)
             self.credentials = {}
             return
 
+        cached = self._CACHE.get(self.config_path)
+        if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+            self.credentials = cached[2]
+            return
+
         try:
-            raw = self.config_path.read_text(encoding="utf-8").strip()
+            raw = self.config_path.read_bytes().strip()
             if not raw:
                 self.credentials = {}
                 return
 
-            try:
-                self.credentials = json.loads(raw)
+            # Un JSON válido empieza con '{' o '['; solo lo demás pasa por base64
+            if raw[:1] in (b"{", b"["):
+                self.credentials = _loads(raw)
                 logger.info("Credenciales cargadas desde JSON")
-            except json.JSONDecodeError:
-                decoded = base64.b64decode(raw.encode("utf-8")).decode("utf-8")
-                self.credentials = json.loads(decoded)
+            else:
+                self.credentials = _loads(base64.b64decode(raw))
                 logger.info("Credenciales convertidas desde formato base64 legacy")
                 self._write_credentials(self.credentials)
+            self._cache_store()
         except Exception as exc:
             logger.error(f"Error cargando credenciales: {exc}")
             self.credentials = {}
 
+    def reload(self) -> None:
+        """Vuelve a cargar las credenciales solo si el archivo cambió en disco."""
+        self._load_credentials()
+
     def save_credentials(self, user: str, password: str, url: Optional[str] = None) -> bool:
         """Persistir credenciales NTLM y opcionalmente la URL del servidor."""
         user = user.strip() if user else user
@@ -78,6 +138,7 @@ class CredentialsManager:
 
             self._write_credentials(payload)
             self.credentials = payload
+            self._cache_store()
             logger.info(f"Credenciales NTLM guardadas para el usuario: {user}")
             return True
         except Exception as exc:
@@ -94,7 +155,8 @@ class CredentialsManager:
         if user and password:
             return user, password
 
-        logger.warning("Credenciales incompletas encontradas")
+        if user or password:
+            logger.warning("Credenciales incompletas encontradas")
         return None, None
 
     def get_server_url(self) -> Optional[str]:
@@ -103,14 +165,15 @@ class CredentialsManager:
 
     def has_credentials(self) -> bool:
         """Indica si existen credenciales completas."""
-        user, password = self.get_credentials()
-        return bool(user) and bool(password)
+        creds = self.credentials
+        return bool(creds) and bool(creds.get("ntlm_user")) and bool(creds.get("ntlm_pass"))
 
     def clear_credentials(self) -> bool:
         """Elimina el archivo con las credenciales guardadas."""
         try:
             if self.config_path.exists():
                 self.config_path.unlink()
+            self._CACHE.pop(self.config_path, None)
             self.credentials = {}
             logger.info("Credenciales eliminadas correctamente")
             return True
@@ -119,4 +182,19 @@ class CredentialsManager:
             return False
 
 
-credentials_manager = CredentialsManager()
+_instance: Optional[CredentialsManager] = None
+
+
+def get_credentials_manager() -> CredentialsManager:
+    """Retorna la instancia compartida, creándola en el primer uso."""
+    global _instance
+    if _instance is None:
+        _instance = CredentialsManager()
+    return _instance
+
+
+def __getattr__(name: str):
+    # Compatibilidad con `from credentials_manager import credentials_manager`
+    if name == "credentials_manager":
+        return get_credentials_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
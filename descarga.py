@@ -6,16 +6,27 @@ import chardet
 import requests
 import time
 import random
-from concurrent.futures import ThreadPoolExecutor
+import shutil
+from itertools import product
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 from requests_ntlm import HttpNtlmAuth
-import glob
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
 from file_utils import (
     confirm_overwrite, confirm_overwrite_all, set_global_overwrite_decision,
     analyze_files, display_file_summary, prompt_download_decision
 )
 from enum import Enum
+from functools import lru_cache, wraps
+import inspect
 import msvcrt  # For Windows file locking
 import contextlib
 import errno
@@ -31,8 +42,14 @@ from utils_logging import (
 from credentials_manager import credentials_manager
 
 # Obtener credenciales desde el manejador local (no desde variables de entorno)
+@lru_cache(maxsize=1)
 def get_ntlm_credentials():
-    """Obtiene las credenciales NTLM desde el archivo local"""
+    """
+    Obtiene las credenciales NTLM desde el archivo local.
+
+    El resultado se memoiza; se invalida con get_ntlm_credentials.cache_clear()
+    al recibir un 401 y al inicio de cada proceso de descarga.
+    """
     user, password = credentials_manager.get_credentials()
     if not user or not password:
         logger.warning("No se encontraron credenciales NTLM válidas. Configure las credenciales en la interfaz.")
@@ -40,18 +57,137 @@ def get_ntlm_credentials():
     return user.strip(), password
 
 # Control de workers para descargas paralelas - ajustable vía variable de entorno
-DEFAULT_WORKERS = 2  # Default to 2 workers if not specified
+DEFAULT_WORKERS = 8  # Default to 8 workers if not specified (capped by the number of files)
 MAX_WORKERS = int(os.getenv('DOWNLOAD_MAX_WORKERS', DEFAULT_WORKERS))
-# Delay entre chunks para throttling de red - ajustable vía variable de entorno (default 0.5s)
+# Espaciado mínimo entre peticiones para throttling de red - ajustable vía variable de entorno (default 0.5s)
 DOWNLOAD_DELAY = float(os.getenv('DOWNLOAD_DELAY', 0.5))
-# Tamaño de chunk reducido para mejor control de red
-CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', 4096))  # Reduced from 8192 to 4096 bytes
+# Tamaño de chunk de lectura; bloques pequeños solo añaden overhead de syscalls
+CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', 65536))
+# Descarga directa: sin progreso parcial por archivo
+DIRECT_DOWNLOAD = os.getenv('DIRECT_DOWNLOAD', 'false').lower() == 'true'
 BASE_URL = os.getenv('REPORT_BASE_URL', 'http://172.27.230.27/ReportServer')
 REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '600'))
 REPORT_FORMAT = 'CSV'
+# Códigos HTTP que no se recuperan reintentando y tope de intentos ante timeouts de conexión
+NON_RETRYABLE_STATUS = frozenset({401, 403, 404})
+CONNECT_TIMEOUT_RETRIES = 2
+# Plantilla de URL de reportes precalculada (solo varían tipo, año y estado)
+_URL_PREFIX = f"{BASE_URL}?%2FAGV_PTP%2FRPT_INMIGRA_PTP_REGUL_CCM&nidtipoTramite="
+_URL_SUFFIX_FMT = "&anio=%d&EstadoTramite=%s&rs:Format=" + REPORT_FORMAT
 STALE_LOCK_MAX_AGE = int(os.getenv('LOCK_MAX_AGE_SECONDS', '0'))  # 0 = eliminar todos los locks pendientes
 LOCK_WAIT_TIMEOUT = float(os.getenv('LOCK_WAIT_TIMEOUT', '30'))  # segundos para esperar antes de abortar
 LOCK_WAIT_INTERVAL = float(os.getenv('LOCK_WAIT_INTERVAL', '0.5'))  # intervalo entre reintentos
+CONSOLIDATION_CACHE_DIR = '.cache'  # Caché Parquet de los CSV ya procesados, dentro de cada carpeta
+CONSOLIDATION_CACHE_VERSION = 2  # Subir al cambiar cómo se leen los CSV: invalida las cachés existentes
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Connection': 'keep-alive'
+}
+
+# Buffer de copia del cuerpo de la respuesta (mínimo 1 MiB)
+COPY_BUFFER_SIZE = max(CHUNK_SIZE, 1 << 20)
+
+def load_download_settings():
+    """
+    Vuelve a leer del entorno los ajustes de descarga que la interfaz puede
+    cambiar en tiempo de ejecución. Se invoca una vez por proceso de descarga,
+    de modo que las funciones de descarga usan los globales sin consultar
+    os.environ en cada archivo o intento.
+    """
+    global MAX_WORKERS, DOWNLOAD_DELAY, CHUNK_SIZE, DIRECT_DOWNLOAD, COPY_BUFFER_SIZE
+    MAX_WORKERS = max(1, int(os.getenv('DOWNLOAD_MAX_WORKERS', DEFAULT_WORKERS)))
+    DOWNLOAD_DELAY = float(os.getenv('DOWNLOAD_DELAY', 0.5))
+    CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', 65536))
+    DIRECT_DOWNLOAD = os.getenv('DIRECT_DOWNLOAD', 'false').lower() == 'true'
+    COPY_BUFFER_SIZE = max(CHUNK_SIZE, 1 << 20)
+
+class _ProgressReader:
+    """
+    Envuelve response.raw para contar los bytes leídos y reportar progreso
+    como máximo cada 500ms mientras shutil.copyfileobj consume el cuerpo.
+    """
+
+    def __init__(self, raw, total_size, progress_callback=None):
+        self.raw = raw
+        self.total_size = total_size
+        self.progress_callback = progress_callback
+        self.bytes_read = 0
+        self._last_update = time.time()
+
+    def read(self, size=-1):
+        try:
+            data = self.raw.read(size, decode_content=True)
+        except Urllib3HTTPError as exc:
+            # Mismo tipo de error que iter_content, para que aplique la lógica de reintentos
+            raise requests.exceptions.ConnectionError(exc)
+        self.bytes_read += len(data)
+        if self.progress_callback and self.total_size > 0:
+            current_time = time.time()
+            if current_time - self._last_update >= 0.5:
+                self.progress_callback((self.bytes_read / self.total_size) * 100)
+                self._last_update = current_time
+        return data
+
+# Pacing global (leaky bucket): cada petición reserva el siguiente instante libre
+_pacing_lock = threading.Lock()
+_next_request_at = 0.0
+
+def _wait_for_request_slot():
+    """Espera hasta que haya pasado DOWNLOAD_DELAY desde la petición anterior (entre todos los workers)."""
+    global _next_request_at
+    if DOWNLOAD_DELAY <= 0:
+        return
+    with _pacing_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + DOWNLOAD_DELAY
+    if wait > 0:
+        time.sleep(wait)
+
+# Una sesión por hilo de descarga: reutiliza la conexión TCP y el handshake NTLM entre archivos
+_thread_local = threading.local()
+
+def get_session():
+    """
+    Retorna la sesión HTTP del hilo actual, creándola en el primer uso.
+
+    La sesión se monta con un HTTPAdapter con pool de conexiones para que
+    todas las descargas del mismo worker compartan conexión keep-alive.
+
+    Returns:
+        requests.Session: Sesión autenticada con NTLM
+    """
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.trust_env = False
+        session.headers.update(HTTP_HEADERS)
+        adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        current_user, current_pass = get_ntlm_credentials()
+        session.auth = HttpNtlmAuth(current_user, current_pass)
+        _thread_local.session = session
+    return session
+
+def reset_session():
+    """Cierra y descarta la sesión del hilo actual (p. ej. tras un 401)."""
+    session = getattr(_thread_local, 'session', None)
+    if session is not None:
+        session.close()
+        _thread_local.session = None
+
+def _crear_pool_descargas(max_workers):
+    """
+    Crea el pool de hilos de descarga. El initializer abre la sesión
+    (keep-alive + NTLM) de cada worker antes de recibir trabajo.
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="descarga",
+        initializer=get_session
+    )
+
 def crear_carpetas():
     """
     Crea y configura las carpetas de salida para cada tipo de trámite.
@@ -90,35 +226,75 @@ def remove_stale_lock_files(base_dir="descargas", max_age=None, log_callback=Non
     if not os.path.exists(base_path):
         return []
 
-    removed = []
     now = time.time()
+    lock_entries = [entry for entry in _scandir_recursive(base_path) if entry.name.endswith(".lock")]
+    if not lock_entries:
+        return []
+
+    def try_remove_lock(entry):
+        """Elimina un lock si es obsoleto; retorna su ruta si se eliminó."""
+        lock_path = entry.path
+        try:
+            # DirEntry.stat() reutiliza la información obtenida al listar el directorio
+            age = now - entry.stat().st_mtime
+        except OSError:
+            return None
 
-    for root, _, files in os.walk(base_path):
-        for name in files:
-            if not name.endswith(".lock"):
-                continue
+        if max_age > 0 and age <= max_age:
+            return None
 
-            lock_path = os.path.join(root, name)
-            try:
-                age = now - os.path.getmtime(lock_path)
-            except OSError:
-                continue
+        try:
+            os.remove(lock_path)
+        except OSError as exc:
+            logger.warning(f"No se pudo eliminar lock obsoleto {lock_path}: {exc}")
+            return None
+
+        message = f"Lock limpiado: {lock_path}"
+        if log_callback:
+            log_callback(message)
+        else:
+            logger.info(message)
+        return lock_path
 
-            should_remove = max_age <= 0 or age > max_age
+    # stat + unlink son I/O puro: se solapan en un pool pequeño (útil en unidades de red)
+    with ThreadPoolExecutor(max_workers=min(8, len(lock_entries))) as executor:
+        return [path for path in executor.map(try_remove_lock, lock_entries) if path]
 
-            if should_remove:
-                try:
-                    os.remove(lock_path)
-                    removed.append(lock_path)
-                    message = f"Lock limpiado: {lock_path}"
-                    if log_callback:
-                        log_callback(message)
-                    else:
-                        logger.info(message)
-                except OSError as exc:
-                    logger.warning(f"No se pudo eliminar lock obsoleto {lock_path}: {exc}")
+def _scandir_recursive(path):
+    """
+    Recorre un directorio recursivamente con os.scandir.
 
-    return removed
+    Args:
+        path (str): Directorio raíz
+
+    Yields:
+        os.DirEntry: Entradas de archivo (no directorios)
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+                elif entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
+def _list_file_names(folder):
+    """
+    Lista los nombres de archivo de una carpeta en una sola lectura de directorio.
+
+    Args:
+        folder (str): Carpeta a listar
+
+    Returns:
+        set[str]: Nombres de archivos presentes (vacío si la carpeta no existe)
+    """
+    try:
+        with os.scandir(folder) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
 def generar_urls_por_partes():
     """
     Genera URLs para la descarga de reportes basados en diferentes parámetros.
@@ -126,27 +302,38 @@ def generar_urls_por_partes():
     Returns:
         dict: Diccionario con tipos de trámite como claves y listas de tuplas (url, año, estado) como valores
     """
-    urls_por_partes = {}
     anios = [2025, 2024, 2023, 2022, 2021, 2020, 2019, 2018]
     estados_tramite = ["A", "P", "B", "R", "D", "E", "N"]
+    combinaciones = list(product(anios, estados_tramite))
 
-    BASE_URL = "http://172.27.230.27/ReportServer"
-    REPORT_FORMAT = "CSV"
+    return {
+        tipo: [
+            (_URL_PREFIX + str(tipo) + _URL_SUFFIX_FMT % (anio, estado), anio, estado)
+            for anio, estado in combinaciones
+        ]
+        for tipo in [58, 57, 317, 55]
+    }
+def _is_retryable(exc, attempt):
+    """
+    Clasifica un error de descarga para decidir si vale la pena reintentar.
 
-    def construir_url(tipo, anio, estado):
-        return (
-            f"{BASE_URL}?%2FAGV_PTP%2FRPT_INMIGRA_PTP_REGUL_CCM"
-            f"&nidtipoTramite={tipo}&anio={anio}"
-            f"&EstadoTramite={estado}&rs:Format={REPORT_FORMAT}",
-            anio, estado
-        )
+    Args:
+        exc (Exception): Error capturado
+        attempt (int): Índice (base 0) del intento que falló
 
-    for tipo in [58, 57, 317, 55]:
-        urls_por_partes[tipo] = [construir_url(tipo, anio, estado) 
-                                for anio in anios 
-                                for estado in estados_tramite]
-    return urls_por_partes
-def descargar_archivo(url, output_path, progress_callback=None, log_callback=None, error_callback=None, overwrite=False):
+    Returns:
+        bool: False para errores de autenticación/permiso/recurso inexistente,
+              o para timeouts de conexión que ya agotaron CONNECT_TIMEOUT_RETRIES
+    """
+    if isinstance(exc, PermissionError):
+        return False
+    response = getattr(exc, 'response', None)
+    if response is not None and response.status_code in NON_RETRYABLE_STATUS:
+        return False
+    if isinstance(exc, requests.exceptions.ConnectTimeout) and attempt + 1 >= CONNECT_TIMEOUT_RETRIES:
+        return False
+    return True
+def descargar_archivo(url, output_path, progress_callback=None, log_callback=None, error_callback=None, overwrite=False, session=None):
     """
     Descarga un archivo usando streaming y manejo de errores mejorado.
 
@@ -157,6 +344,7 @@ def descargar_archivo(url, output_path, progress_callback=None, log_callback=Non
         log_callback (callable): Función para registrar mensajes
         error_callback (callable): Función para manejar errores
         overwrite (bool): Si se debe sobrescribir archivos existentes
+        session (requests.Session): Sesión a reutilizar; por defecto la del hilo actual
 
     Returns:
         bool: True si la descarga fue exitosa, False en caso contrario
@@ -166,16 +354,8 @@ def descargar_archivo(url, output_path, progress_callback=None, log_callback=Non
             log_callback(f"Omitiendo descarga, archivo existente: {output_path}")
         return True
     
-    session = requests.Session()
-    session.trust_env = False
-    # Obtener credenciales actuales desde el manejador
-    current_user, current_pass = get_ntlm_credentials()
-    auth = HttpNtlmAuth(current_user, current_pass)
-    session.auth = auth
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Connection': 'keep-alive'
-    })
+    if session is None:
+        session = get_session()
     
     retries = 5  # Increased retries
     retry_delay = 5  # Initial delay in seconds
@@ -185,51 +365,32 @@ def descargar_archivo(url, output_path, progress_callback=None, log_callback=Non
     
     @contextlib.contextmanager
     def file_lock(file_path):
-        lock_fd = None
+        # Un único lock del SO (msvcrt.locking) sobre el archivo .lock. El sistema lo libera
+        # si el proceso muere, así que no hace falta detectar ni limpiar locks obsoletos.
+        lock_fd = os.open(file_path, os.O_CREAT | os.O_RDWR)
         start_wait = time.time()
-
-        while True:
-            try:
-                lock_fd = os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
-                break
-            except OSError as e:
-                if e.errno == errno.EEXIST:
-                    try:
-                        age = time.time() - os.path.getmtime(file_path)
-                    except OSError:
-                        age = 0
-
-                    if STALE_LOCK_MAX_AGE <= 0 or age > STALE_LOCK_MAX_AGE:
-                        try:
-                            os.remove(file_path)
-                            message = f"Lock limpiado: {file_path}"
-                            if log_callback:
-                                log_callback(message)
-                            else:
-                                logger.info(message)
-                            continue
-                        except OSError as exc:
-                            logger.warning(f"No se pudo eliminar lock obsoleto {file_path}: {exc}")
-
+        try:
+            while True:
+                try:
+                    msvcrt.locking(lock_fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
                     if time.time() - start_wait >= LOCK_WAIT_TIMEOUT:
                         if log_callback:
                             log_callback(f"Otro proceso está descargando el archivo: {output_path}")
                         raise IOError("File is locked by another process")
-
                     time.sleep(LOCK_WAIT_INTERVAL)
-                    continue
-                raise
 
-        try:
-            msvcrt.locking(lock_fd, msvcrt.LK_NBLCK, 1)
-            yield
-        finally:
             try:
-                msvcrt.locking(lock_fd, msvcrt.LK_UNLCK, 1)
-            except (IOError, OSError):
-                pass
-            if lock_fd is not None:
-                os.close(lock_fd)
+                yield
+            finally:
+                try:
+                    msvcrt.locking(lock_fd, msvcrt.LK_UNLCK, 1)
+                except (IOError, OSError):
+                    pass
+        finally:
+            os.close(lock_fd)
+            # Falla sin efecto si otro proceso aún tiene el archivo abierto
             try:
                 os.remove(file_path)
             except (IOError, OSError):
@@ -240,84 +401,58 @@ def descargar_archivo(url, output_path, progress_callback=None, log_callback=Non
             if log_callback:
                 log_callback(f"Intento {attempt + 1} de {retries} - Iniciando descarga: {url}")
             
-            # Get direct download preference from environment
-            direct_download = os.getenv('DIRECT_DOWNLOAD', 'false').lower() == 'true'
-            
-            # Reset session for each attempt to avoid stale connections
-            if attempt > 0:
-                session.close()
-                session = requests.Session()
-                session.trust_env = False
-                # Obtener credenciales actualizadas para cada intento
-                current_user, current_pass = get_ntlm_credentials()
-                auth = HttpNtlmAuth(current_user, current_pass)
-                session.auth = auth
-                session.headers.update({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Connection': 'keep-alive'
-                })
-            
-            # Try to acquire the lock before proceeding with download
-            with file_lock(lock_file_path):
-                response = session.get(
-                    url,
-                    timeout=REQUEST_TIMEOUT,
-                    stream=not direct_download,
-                    auth=auth
-                )
-                if response.status_code == 401:
-                    response.close()
-                    raise PermissionError("Autenticación NTLM rechazada (401 Unauthorized)")
+            # La petición HTTP (handshake NTLM incluido) se hace fuera del lock
+            _wait_for_request_slot()
+            response = session.get(url, timeout=REQUEST_TIMEOUT, stream=True)
+            if response.status_code == 401:
+                response.close()
+                # Descartar sesión y credenciales memoizadas para que el próximo uso las relea
+                get_ntlm_credentials.cache_clear()
+                reset_session()
+                raise PermissionError("Autenticación NTLM rechazada (401 Unauthorized)")
+            try:
                 response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                response.close()
+                raise
             
             total_size = int(response.headers.get('content-length', 0))
             bytes_downloaded = 0
-            last_progress_update = time.time()
             
-            # Create a new temp file for each attempt
-            with open(temp_file_path, 'wb') as file:
-                if direct_download:
-                    # Direct download without chunks
-                    content = response.content
-                    file.write(content)
-                    if progress_callback and total_size > 0:
+            # El lock protege solo la escritura del archivo temporal y el reemplazo final;
+            # si no se obtiene, la respuesta se cierra al salir del with
+            with response, file_lock(lock_file_path):
+                # Create a new temp file for each attempt
+                with open(temp_file_path, 'wb') as file:
+                    # Siempre se copia en bloques desde el socket para no cargar el cuerpo
+                    # completo en memoria; la descarga directa solo omite el progreso parcial
+                    reader = _ProgressReader(
+                        response.raw, total_size,
+                        None if DIRECT_DOWNLOAD else progress_callback
+                    )
+                    shutil.copyfileobj(reader, file, length=COPY_BUFFER_SIZE)
+                    bytes_downloaded = reader.bytes_read
+                    if DIRECT_DOWNLOAD and progress_callback and total_size > 0:
                         progress_callback(100)
-                else:
-                    # Chunk-based download with progress tracking
-                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
-                        if chunk:
-                            file.write(chunk)
-                            bytes_downloaded += len(chunk)
-                            
-                            # Update progress less frequently to reduce overhead
-                            current_time = time.time()
-                            if current_time - last_progress_update >= 0.5:  # Update every 500ms
-                                if progress_callback and total_size > 0:
-                                    progress = (bytes_downloaded / total_size) * 100
-                                    progress_callback(progress)
-                                last_progress_update = current_time
-                                
-                            if DOWNLOAD_DELAY > 0:
-                                time.sleep(DOWNLOAD_DELAY)
-            
-            # Verify file size if content-length was provided
-            if total_size > 0 and os.path.getsize(temp_file_path) != total_size:
-                raise requests.exceptions.RequestException("Downloaded file size mismatch")
-            
-            # Only rename the file if download completed successfully
-            try:
-                os.replace(temp_file_path, output_path)
-                if log_callback:
-                    log_callback(f"Archivo descargado correctamente: {output_path}")
-                return True
-            except OSError as e:
-                if e.errno == errno.EACCES:
-                    # File is being used by another process
-                    if error_callback:
-                        error_callback(output_path, "El archivo está siendo usado por otro proceso")
-                    time.sleep(1)  # Wait before retry
-                    continue
-                raise
+                
+                # Verify file size if content-length was provided (sin stat extra: ya se contaron los bytes)
+                if total_size > 0 and bytes_downloaded != total_size:
+                    raise requests.exceptions.RequestException("Downloaded file size mismatch")
+                
+                # Only rename the file if download completed successfully
+                try:
+                    os.replace(temp_file_path, output_path)
+                    if log_callback:
+                        log_callback(f"Archivo descargado correctamente: {output_path}")
+                    return True
+                except OSError as e:
+                    if e.errno == errno.EACCES:
+                        # File is being used by another process
+                        if error_callback:
+                            error_callback(output_path, "El archivo está siendo usado por otro proceso")
+                        time.sleep(1)  # Wait before retry
+                        continue
+                    raise
     
         except PermissionError as e:
             last_exception = e
@@ -337,6 +472,10 @@ def descargar_archivo(url, output_path, progress_callback=None, log_callback=Non
                 except:
                     pass
             
+            # Errores que no se resuelven reintentando: cortar sin backoff
+            if not _is_retryable(e, attempt):
+                break
+            
             if attempt < retries - 1:
                 # Exponential backoff with jitter
                 jitter = random.uniform(0, 1)
@@ -361,15 +500,12 @@ def descargar_archivo(url, output_path, progress_callback=None, log_callback=Non
                 except:
                     pass
             return False
-            
-        finally:
-            session.close()
     
-    # If we get here, all retries failed
+    # If we get here, all retries failed (or the error was not retryable)
     if error_callback and last_exception:
-        error_callback(output_path, f"Descarga fallida después de {retries} intentos. Último error: {str(last_exception)}")
+        error_callback(output_path, f"Descarga fallida después de {attempt + 1} intentos. Último error: {str(last_exception)}")
     return False
-def descargar_en_paralelo(tipo, urls, output_folder, progress_callback=None, log_callback=None, error_callback=None):
+def descargar_en_paralelo(tipo, urls, output_folder, progress_callback=None, log_callback=None, error_callback=None, executor=None):
     """
     Gestiona las descargas en paralelo con mejor manejo de errores.
     
@@ -380,47 +516,59 @@ def descargar_en_paralelo(tipo, urls, output_folder, progress_callback=None, log
         progress_callback (callable): Función para actualizar la barra de progreso
         log_callback (callable): Función para registrar mensajes
         error_callback (callable): Función para manejar errores
+        executor (ThreadPoolExecutor): Pool compartido; si no se indica se crea uno propio
 
     Returns:
         list: Lista de rutas de archivos descargados exitosamente
     """
     total_files = len(urls)
-    completed_files = 0
-    downloaded_files = []
-    tasks = []
-    
-    # Get current worker count from environment
-    current_workers = int(os.getenv('DOWNLOAD_MAX_WORKERS', DEFAULT_WORKERS))
-    with ThreadPoolExecutor(max_workers=current_workers) as executor:
-        # Create tasks list with futures and their corresponding file paths
-        for url, anio, estado in urls:
-            file_path = os.path.join(output_folder, f"{anio}_{estado}.csv")
-            future = executor.submit(
-                descargar_archivo, url, file_path,
-                progress_callback=None, log_callback=log_callback,
-                error_callback=error_callback, overwrite=True
+    if not total_files:
+        return []
+
+    if executor is None:
+        # No more workers than files
+        current_workers = max(1, min(MAX_WORKERS, total_files))
+        with _crear_pool_descargas(current_workers) as own_executor:
+            return descargar_en_paralelo(
+                tipo, urls, output_folder,
+                progress_callback, log_callback, error_callback,
+                executor=own_executor
             )
-            tasks.append((future, file_path))
-        
-        # Process completed tasks
-        for future, file_path in tasks:
-            try:
-                if future.result():
-                    downloaded_files.append(file_path)
-                completed_files += 1
-                if progress_callback:
-                    progress = (completed_files / total_files) * 80  # Scale to 80%
-                    progress_callback(progress)
-            except requests.exceptions.RequestException as e:
-                if error_callback:
-                    error_callback("archivo", f"Error de conexión en la descarga: {str(e)}")
-                continue
-            except Exception as e:
-                if error_callback:
-                    error_callback("archivo", f"Error inesperado en la descarga: {str(e)}")
-                continue
+
+    completed_files = 0
+    downloaded = {}
+    # Map futures to their submission index and file path
+    future_to_task = {}
+    for index, (url, anio, estado) in enumerate(urls):
+        file_path = os.path.join(output_folder, f"{anio}_{estado}.csv")
+        future = executor.submit(
+            descargar_archivo, url, file_path,
+            progress_callback=None, log_callback=log_callback,
+            error_callback=error_callback, overwrite=True
+        )
+        future_to_task[future] = (index, file_path)
     
-    return downloaded_files
+    # Process tasks as they complete so a slow download doesn't stall progress
+    for future in as_completed(future_to_task):
+        index, file_path = future_to_task[future]
+        try:
+            if future.result():
+                downloaded[index] = file_path
+            completed_files += 1
+            if progress_callback:
+                progress = (completed_files / total_files) * 80  # Scale to 80%
+                progress_callback(progress)
+        except requests.exceptions.RequestException as e:
+            if error_callback:
+                error_callback("archivo", f"Error de conexión en la descarga: {str(e)}")
+            continue
+        except Exception as e:
+            if error_callback:
+                error_callback("archivo", f"Error inesperado en la descarga: {str(e)}")
+            continue
+
+    # Keep submission order so the consolidated output stays deterministic
+    return [downloaded[index] for index in sorted(downloaded)]
 def descargar_y_consolidar(download_option='all', progress_callback=None, log_callback=None, error_callback=None, overwrite=False, selected_modules=None):
     """
     Gestiona el proceso de descarga y consolidación de archivos.
@@ -432,8 +580,12 @@ def descargar_y_consolidar(download_option='all', progress_callback=None, log_ca
         error_callback (callable): Función para manejar errores
         overwrite (bool): Si se debe sobrescribir archivos existentes
     """
+    # Tomar una sola vez los ajustes fijados por la interfaz para esta ejecución
+    load_download_settings()
     folders = crear_carpetas()
     remove_stale_lock_files(log_callback=log_callback)
+    # Releer credenciales por si se modificaron en la interfaz desde la última ejecución
+    get_ntlm_credentials.cache_clear()
     
     # Create a mapping of module names to IDs
     module_name_to_id = {"CCM": 58, "PRR": 57}
@@ -467,9 +619,14 @@ def descargar_y_consolidar(download_option='all', progress_callback=None, log_ca
             if log_callback:
                 log_callback(f"Consolidando archivos de {folder_name}...")
             
-            # Get all CSV files except previously consolidated ones
-            all_files = glob.glob(os.path.join(folder, "*.csv"))
-            files_to_consolidate = [f for f in all_files if 'consolidado_total' not in f]
+            # Get all CSV files except previously consolidated ones (una sola lectura del directorio)
+            with os.scandir(folder) as entries:
+                files_to_consolidate = [
+                    entry.path for entry in entries
+                    if entry.name.endswith('.csv')
+                    and not entry.name.startswith('consolidado_total')
+                    and entry.is_file()
+                ]
             
             # Consolidate with full progress range (0-100%)
             try:
@@ -510,37 +667,43 @@ def descargar_y_consolidar(download_option='all', progress_callback=None, log_ca
     if log_callback:
         log_callback("Iniciando proceso de descarga...")
     
-    # Process downloads
-    for tipo, urls in urls_por_partes.items():
-        if log_callback:
-            log_callback(f"Procesando descargas para tipo {tipo}...")
-        output_folder = folders[tipo]
-        
-        if download_option == "missing":
-            urls_to_download = []
-            for url, anio, estado in urls:
-                file_path = os.path.join(output_folder, f"{anio}_{estado}.csv")
-                if not os.path.exists(file_path):
-                    urls_to_download.append((url, anio, estado))
+    # Un único pool para todos los tipos: los hilos y sus sesiones keep-alive
+    # se reutilizan entre módulos en lugar de recrearse por cada tipo
+    with _crear_pool_descargas(MAX_WORKERS) as executor:
+        # Process downloads
+        for tipo, urls in urls_por_partes.items():
+            if log_callback:
+                log_callback(f"Procesando descargas para tipo {tipo}...")
+            output_folder = folders[tipo]
             
-            if urls_to_download:
+            if download_option == "missing":
+                # Un solo listado de la carpeta en lugar de un stat por URL
+                existing_names = _list_file_names(output_folder)
+                urls_to_download = [
+                    (url, anio, estado) for url, anio, estado in urls
+                    if f"{anio}_{estado}.csv" not in existing_names
+                ]
+                
+                if urls_to_download:
+                    if log_callback:
+                        log_callback(f"Descargando {len(urls_to_download)} archivos faltantes...")
+                    downloaded_by_type[tipo] = descargar_en_paralelo(
+                        tipo, urls_to_download, output_folder,
+                        progress_callback, log_callback, error_callback,
+                        executor=executor
+                    )
+                else:
+                    if log_callback:
+                        log_callback("No hay archivos faltantes para descargar.")
+                    downloaded_by_type[tipo] = []
+            else:  # download_option == "all"
                 if log_callback:
-                    log_callback(f"Descargando {len(urls_to_download)} archivos faltantes...")
+                    log_callback(f"Descargando/actualizando todos los archivos...")
                 downloaded_by_type[tipo] = descargar_en_paralelo(
-                    tipo, urls_to_download, output_folder,
-                    progress_callback, log_callback, error_callback
+                    tipo, urls, output_folder,
+                    progress_callback, log_callback, error_callback,
+                    executor=executor
                 )
-            else:
-                if log_callback:
-                    log_callback("No hay archivos faltantes para descargar.")
-                downloaded_by_type[tipo] = []
-        else:  # download_option == "all"
-            if log_callback:
-                log_callback(f"Descargando/actualizando todos los archivos...")
-            downloaded_by_type[tipo] = descargar_en_paralelo(
-                tipo, urls, output_folder,
-                progress_callback, log_callback, error_callback
-            )
     
     if log_callback:
         log_callback("Proceso de descarga completado.")
@@ -574,9 +737,56 @@ def descargar_y_consolidar(download_option='all', progress_callback=None, log_ca
     
     return consolidation_success
 
+def _memoize_report(method):
+    """
+    Memoiza un método de reporte de OperatorReport por (método, argumentos).
+    La caché vive en la instancia y se vacía al reasignar report.df; se
+    devuelve una copia para que el llamador no altere el resultado guardado.
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(bound.arguments.values())[1:]
+        if key not in self._cache:
+            self._cache[key] = method(self, *args, **kwargs)
+        return self._cache[key].copy()
+    return wrapper
+
 class OperatorReport:
     """Clase para generar reportes de operadores basados en los datos consolidados."""
     
+    REQUIRED_COLUMNS = [
+        'FechaPre',
+        'OperadorPre',
+        'NumeroTramite',
+        'FechaExpendiente'
+    ]
+    
+    OPTIONAL_COLUMNS = [
+        'FechaEtapaAprobacionMasivaFin'
+    ]
+    
+    # Extended column mapping dictionary with historical names
+    COLUMN_MAPPINGS = {
+        'FECHA DE TRABAJO': 'FechaPre',
+        'FECHA TRABAJO': 'FechaPre',
+        'FECHA_TRABAJO': 'FechaPre',
+        'EVALUADOR': 'OperadorPre',
+        'OPERADOR': 'OperadorPre',
+        'EVALUADOR_PRE': 'OperadorPre',
+        'EXPEDIENTE': 'NumeroTramite',
+        'NRO_EXPEDIENTE': 'NumeroTramite',
+        'NRO_TRAMITE': 'NumeroTramite',
+        'FECHA_APROBACION': 'FechaEtapaAprobacionMasivaFin',
+        'FECHA_EXPEDIENTE': 'FechaExpendiente'
+    }
+    
+    # Only these columns (current or historical names) are loaded from the consolidated CSV
+    LOADED_COLUMNS = frozenset(REQUIRED_COLUMNS + OPTIONAL_COLUMNS) | frozenset(COLUMN_MAPPINGS)
+    
     def _map_and_validate_columns(self):
         """
         Maps alternate column names and validates required columns existence.
@@ -585,47 +795,31 @@ class OperatorReport:
         Raises:
             ValueError: If critical required columns are missing after mapping attempt.
         """
-        required_columns = [
-            'FechaPre',
-            'OperadorPre',
-            'NumeroTramite',
-            'FechaExpendiente'
-        ]
+        required_columns = self.REQUIRED_COLUMNS
         
-        optional_columns = [
-            'FechaEtapaAprobacionMasivaFin'
-        ]
-        
-        # Extended column mapping dictionary with historical names
-        column_mappings = {
-            'FECHA DE TRABAJO': 'FechaPre',
-            'FECHA TRABAJO': 'FechaPre',
-            'FECHA_TRABAJO': 'FechaPre',
-            'EVALUADOR': 'OperadorPre',
-            'OPERADOR': 'OperadorPre',
-            'EVALUADOR_PRE': 'OperadorPre',
-            'EXPEDIENTE': 'NumeroTramite',
-            'NRO_EXPEDIENTE': 'NumeroTramite',
-            'NRO_TRAMITE': 'NumeroTramite',
-            'FECHA_APROBACION': 'FechaEtapaAprobacionMasivaFin',
-            'FECHA_EXPEDIENTE': 'FechaExpendiente'
-        }
-        
-        # Apply column mappings
-        for old_col, new_col in column_mappings.items():
-            if old_col in self.df.columns and new_col not in self.df.columns:
-                self.df.rename(columns={old_col: new_col}, inplace=True)
+        # Build a single rename map (first historical name found wins, as before)
+        cols_set = set(self.df.columns)
+        rename_map = {}
+        for old_col, new_col in self.COLUMN_MAPPINGS.items():
+            if old_col in cols_set and new_col not in cols_set:
+                rename_map[old_col] = new_col
+                cols_set.add(new_col)
+        if rename_map:
+            self.df = self.df.rename(columns=rename_map)
+            cols_set.difference_update(rename_map)
         
         # Handle special date columns
-        if 'FechaEtapaAprobacionMasivaFin' not in self.df.columns:
+        if 'FechaEtapaAprobacionMasivaFin' not in cols_set:
             self.df['FechaEtapaAprobacionMasivaFin'] = pd.NaT
+            cols_set.add('FechaEtapaAprobacionMasivaFin')
             
-        if 'FechaExpendiente' not in self.df.columns:
+        if 'FechaExpendiente' not in cols_set:
             # Use FechaPre as FechaExpendiente if available, otherwise NaT
-            self.df['FechaExpendiente'] = self.df['FechaPre'] if 'FechaPre' in self.df.columns else pd.NaT
+            self.df['FechaExpendiente'] = self.df['FechaPre'] if 'FechaPre' in cols_set else pd.NaT
+            cols_set.add('FechaExpendiente')
         
         # Check for missing columns after mapping
-        missing_columns = [col for col in required_columns if col not in self.df.columns]
+        missing_columns = [col for col in required_columns if col not in cols_set]
         if missing_columns:
             raise ValueError(
                 f"Las siguientes columnas requeridas están ausentes en el archivo: {', '.join(missing_columns)}"
@@ -644,30 +838,62 @@ class OperatorReport:
             '%Y-%m-%d'
         ]
         
+        # Detect the format of each column on a small sample and group columns sharing it
+        columns_by_format = {}
         for col in date_columns:
-            if col in self.df.columns:
-                # Try each format until one works
-                for date_format in date_formats:
-                    try:
-                        self.df[col] = pd.to_datetime(
-                            self.df[col],
-                            format=date_format,
-                            dayfirst=True,
-                            errors='coerce'
-                        )
-                        # If successful, break the format loop
-                        if self.df[col].notna().any():
-                            break
-                    except (ValueError, TypeError):
-                        continue
-                
-                # If no format worked, try the generic parser as last resort
-                if self.df[col].isna().all():
-                    self.df[col] = pd.to_datetime(
-                        self.df[col],
-                        dayfirst=True,
-                        errors='coerce'
-                    )
+            if col in self.df.columns and not pd.api.types.is_datetime64_any_dtype(self.df[col]):
+                date_format = self._detect_date_format(self.df[col], date_formats)
+                columns_by_format.setdefault(date_format, []).append(col)
+        
+        n_rows = len(self.df)
+        for date_format, cols in columns_by_format.items():
+            # Parse all columns of the group in a single call over the stacked values, so
+            # cache=True deduplicates timestamps repeated across columns
+            stacked = pd.concat([self.df[col] for col in cols], ignore_index=True)
+            if date_format:
+                parsed = pd.to_datetime(stacked, format=date_format, errors='coerce', cache=True)
+            else:
+                # If no format matched the sample, use the generic parser as last resort
+                parsed = pd.to_datetime(stacked, dayfirst=True, errors='coerce', cache=True)
+            parsed_values = parsed.to_numpy()
+            for i, col in enumerate(cols):
+                self.df[col] = parsed_values[i * n_rows:(i + 1) * n_rows]
+    
+    @staticmethod
+    def _detect_date_format(series, date_formats, sample_size=100):
+        """
+        Returns the format that parses the largest share of a sample of the series.
+        
+        Args:
+            series (pd.Series): Column with raw date values
+            date_formats (list): Candidate formats, in priority order (first wins ties)
+            sample_size (int): Number of non-null values to test
+            
+        Returns:
+            str or None: Best matching format, or None if none parses any value
+        """
+        sample = series.dropna().astype(str).head(sample_size)
+        if sample.empty:
+            return None
+        best_format, best_ratio = None, 0.0
+        for date_format in date_formats:
+            ratio = pd.to_datetime(sample, format=date_format, errors='coerce').notna().mean()
+            if ratio > best_ratio:
+                best_format, best_ratio = date_format, ratio
+                if ratio == 1.0:
+                    break
+        return best_format
+    
+    @property
+    def df(self):
+        """DataFrame con los datos consolidados y columnas auxiliares."""
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        # Reasignar los datos invalida los reportes memoizados
+        self._df = value
+        self._cache = {}
     
     def __init__(self, consolidated_file_path):
         """
@@ -679,32 +905,117 @@ class OperatorReport:
         Raises:
             ValueError: Si faltan columnas requeridas en el archivo
         """
-        self.df = pd.read_csv(consolidated_file_path, encoding='utf-8-sig', low_memory=False)
+        # Load only the report columns, as strings (dates are parsed later),
+        # with Arrow's multi-threaded CSV reader
+        with open(consolidated_file_path, newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f), [])
+        columns = [col for col in header if col in self.LOADED_COLUMNS]
+        table = pacsv.read_csv(
+            consolidated_file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, encoding='utf-8-sig'),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={col: pa.string() for col in columns},
+                # Empty cells are missing values, as with pd.read_csv
+                strings_can_be_null=True
+            )
+        )
+        self.df = table.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+        del table
         
         # Map and validate columns
         self._map_and_validate_columns()
         
-        # Standardize date columns
+        # Operators repeat across many rows: categorical codes shrink the column and
+        # speed up the groupby/pivot keys (group with observed=True)
+        self.df['OperadorPre'] = self.df['OperadorPre'].astype('category')
+        
+        # Standardize date columns (once; report methods rely on datetime64 dtype)
         self._standardize_dates()
         
+        # Raw datetime64 arrays in a common unit for the helper columns below
+        fecha_pre = self.df['FechaPre'].to_numpy(dtype='datetime64[ns]')
+        fecha_aprobacion = self.df['FechaEtapaAprobacionMasivaFin'].to_numpy(dtype='datetime64[ns]')
+        pre_missing = np.isnat(fecha_pre)
+        
         # Create helper columns for completion status and date with historical compatibility
-        self.df['is_completed'] = ~(
-            self.df['FechaPre'].isna() & 
-            self.df['FechaEtapaAprobacionMasivaFin'].isna()
-        )
+        self.df['is_completed'] = ~(pre_missing & np.isnat(fecha_aprobacion))
         
-        # Create completion date with fallback mechanism
-        completion_columns = ['FechaPre', 'FechaEtapaAprobacionMasivaFin']
-        self.df['completion_date'] = self.df[completion_columns].min(axis=1)
+        # Create completion date with fallback mechanism (fmin skips NaT like min(axis=1))
+        self.df['completion_date'] = np.fmin(fecha_pre, fecha_aprobacion)
         
-        # Additional helper columns for historical analysis
-        self.df['processing_time'] = (
-            self.df['FechaEtapaAprobacionMasivaFin'] - self.df['FechaPre']
-        ).dt.total_seconds() / 86400  # Convert to days
+        # Additional helper columns for historical analysis (NaT yields NaN days)
+        self.df['processing_time'] = (fecha_aprobacion - fecha_pre) / np.timedelta64(1, 'D')
         
         # Mark active status
-        self.df['is_active'] = ~self.df['FechaPre'].isna()
+        self.df['is_active'] = ~pre_missing
+    
+    @staticmethod
+    def _period_keys(dates, grouping):
+        """
+        Returns compact period keys (Period / int64) to group by, without building
+        one string per row. Use _period_labels on the aggregated keys for display.
+        
+        Args:
+            dates (pd.Series): datetime64 column
+            grouping (TimeGrouping): Agrupación temporal
+            
+        Returns:
+            pd.Series: Period keys, ordered chronologically
+        """
+        if grouping == TimeGrouping.DAILY:
+            return dates.dt.to_period('D')
+        elif grouping == TimeGrouping.WEEKLY:
+            # Same week number as strftime('%U'): weeks start on Sunday, days before
+            # the first Sunday of the year belong to week 00
+            weekday_from_sunday = (dates.dt.dayofweek + 1) % 7
+            week = (dates.dt.dayofyear - 1 + 7 - weekday_from_sunday) // 7
+            return dates.dt.year * 100 + week
+        elif grouping == TimeGrouping.MONTHLY:
+            return dates.dt.to_period('M')
+        else:  # YEARLY
+            return dates.dt.year
     
+    @staticmethod
+    def _period_labels(keys, grouping):
+        """
+        Converts aggregated period keys to the report labels
+        (date, 'YYYY-Www', 'YYYY-MM' or year).
+        """
+        if grouping == TimeGrouping.DAILY:
+            return [key.to_timestamp().date() for key in keys]
+        elif grouping == TimeGrouping.WEEKLY:
+            return [f"{int(key) // 100}-W{int(key) % 100:02d}" for key in keys]
+        elif grouping == TimeGrouping.MONTHLY:
+            return [str(key) for key in keys]
+        else:  # YEARLY
+            return [int(key) for key in keys]
+    
+    @staticmethod
+    def _range_mask(dates, lower=None, upper=None, upper_inclusive=True):
+        """
+        Builds a single boolean mask for lower <= dates <= upper (or < upper),
+        so the frame is sliced once for both bounds.
+        
+        Returns:
+            np.ndarray: Boolean mask aligned with dates
+        """
+        mask = np.ones(len(dates), dtype=bool)
+        if lower is not None:
+            mask &= (dates >= lower).to_numpy(dtype=bool, na_value=False)
+        if upper is not None:
+            within_upper = dates <= upper if upper_inclusive else dates < upper
+            mask &= within_upper.to_numpy(dtype=bool, na_value=False)
+        return mask
+    
+    @classmethod
+    def _day_range_mask(cls, dates, start_date=None, end_date=None):
+        """Mask for 'dd/mm/YYYY' bounds; the end day is included in full."""
+        lower = pd.Timestamp(datetime.strptime(start_date, '%d/%m/%Y')) if start_date else None
+        upper = pd.Timestamp(datetime.strptime(end_date, '%d/%m/%Y')) + pd.Timedelta(days=1) if end_date else None
+        return cls._range_mask(dates, lower, upper, upper_inclusive=False)
+    
+    @_memoize_report
     def get_workload_metrics(self, start_date=None, end_date=None, grouping=TimeGrouping.MONTHLY):
         """
         Genera métricas de carga de trabajo, completados y backlog por período.
@@ -726,25 +1037,16 @@ class OperatorReport:
                 - productivity_per_evaluator: Productividad por evaluador
                 - days_to_resolve_backlog: Días estimados para resolver el backlog
         """
-        # Filtrar por rango de fechas si se especifica
-        df_filtered = self.df.copy()
+        # Solo las columnas que usa el reporte, sin copiar el DataFrame completo
+        df_filtered = self.df[['FechaExpendiente', 'NumeroTramite', 'is_completed', 'OperadorPre', 'processing_time']]
         
-        if start_date:
-            start_dt = datetime.strptime(start_date, '%d/%m/%Y').date()
-            df_filtered = df_filtered[df_filtered['FechaExpendiente'].dt.date >= start_dt]
-        if end_date:
-            end_dt = datetime.strptime(end_date, '%d/%m/%Y').date()
-            df_filtered = df_filtered[df_filtered['FechaExpendiente'].dt.date <= end_dt]
+        # Filtrar por rango de fechas si se especifica
+        # Comparar contra Timestamps (el día final se incluye completo)
+        if start_date or end_date:
+            df_filtered = df_filtered.loc[self._day_range_mask(df_filtered['FechaExpendiente'], start_date, end_date)]
             
         # Crear columna de período según la agrupación especificada
-        if grouping == TimeGrouping.DAILY:
-            df_filtered['Periodo'] = df_filtered['FechaExpendiente'].dt.date
-        elif grouping == TimeGrouping.WEEKLY:
-            df_filtered['Periodo'] = df_filtered['FechaExpendiente'].dt.strftime('%Y-W%U')
-        elif grouping == TimeGrouping.MONTHLY:
-            df_filtered['Periodo'] = df_filtered['FechaExpendiente'].dt.strftime('%Y-%m')
-        else:  # YEARLY
-            df_filtered['Periodo'] = df_filtered['FechaExpendiente'].dt.year
+        df_filtered = df_filtered.assign(Periodo=self._period_keys(df_filtered['FechaExpendiente'], grouping))
         
         # Calcular métricas básicas por período
         metrics = df_filtered.groupby('Periodo').agg({
@@ -756,34 +1058,38 @@ class OperatorReport:
         
         # Renombrar columnas
         metrics.columns = ['Periodo', 'incoming', 'completions', 'active_evaluators', 'avg_processing_time']
+        metrics['Periodo'] = self._period_labels(metrics['Periodo'], grouping)
         
-        # Calcular métricas adicionales
-        metrics['period_backlog'] = metrics['incoming'] - metrics['completions']
-        metrics['cumulative_backlog'] = metrics['period_backlog'].cumsum()
+        # Arrays base: todas las métricas derivadas se calculan en NumPy a partir de ellos
+        incoming = metrics['incoming'].to_numpy(dtype=np.int64)
+        completions = metrics['completions'].to_numpy(dtype=np.int64)
+        evaluators = metrics['active_evaluators'].to_numpy(dtype=np.int64)
+        period_backlog = incoming - completions
+        cumulative_backlog = np.cumsum(period_backlog)
+        completions_f = completions.astype(float)
         
-        # Calcular tasa de completitud (con manejo de división por cero)
-        metrics['completion_rate'] = metrics.apply(
-            lambda x: x['completions'] / x['incoming'] if x['incoming'] > 0 else 0,
-            axis=1
-        )
-        
-        # Calcular productividad por evaluador (con manejo de división por cero)
-        metrics['productivity_per_evaluator'] = metrics.apply(
-            lambda x: x['completions'] / x['active_evaluators'] if x['active_evaluators'] > 0 else 0,
-            axis=1
-        )
-        
-        # Calcular días estimados para resolver backlog (con manejo de división por cero)
-        metrics['days_to_resolve_backlog'] = metrics.apply(
-            lambda x: x['cumulative_backlog'] / (x['completions'] / 30) if x['completions'] > 0 else float('inf'),
-            axis=1
+        metrics = metrics.assign(
+            # Calcular métricas adicionales
+            period_backlog=period_backlog,
+            cumulative_backlog=cumulative_backlog,
+            # Calcular tasa de completitud (con manejo de división por cero)
+            completion_rate=np.divide(
+                completions_f, incoming, out=np.zeros_like(completions_f), where=incoming > 0
+            ),
+            # Calcular productividad por evaluador (con manejo de división por cero)
+            productivity_per_evaluator=np.divide(
+                completions_f, evaluators, out=np.zeros_like(completions_f), where=evaluators > 0
+            ),
+            # Calcular días estimados para resolver backlog (con manejo de división por cero)
+            days_to_resolve_backlog=np.divide(
+                cumulative_backlog, completions_f / 30, out=np.full_like(completions_f, np.inf), where=completions > 0
+            )
         )
         
-        # Ordenar por período
-        metrics = metrics.sort_values('Periodo')
-        
+        # groupby ya devuelve los períodos ordenados cronológicamente
         return metrics
 
+    @_memoize_report
     def get_operator_workload(self, start_date=None, end_date=None, grouping=TimeGrouping.MONTHLY):
         """
         Genera un reporte de carga de trabajo por operador en formato de tabla pivote.
@@ -797,42 +1103,31 @@ class OperatorReport:
             pd.DataFrame: DataFrame con el reporte de carga de trabajo en formato pivot,
                         donde las filas son operadores y las columnas son períodos
         """
-        # Filtrar por rango de fechas si se especifica
-        df_filtered = self.df.copy()
+        # Solo las columnas que usa el reporte; dropna ya devuelve un DataFrame nuevo
+        df_filtered = self.df[['FechaPre', 'OperadorPre', 'NumeroTramite']]
         
         # Eliminar filas donde FechaPre es nulo
         df_filtered = df_filtered.dropna(subset=['FechaPre'])
         
         # Convertir fechas de entrada y filtrar
-        if start_date:
-            start_dt = datetime.strptime(start_date, '%d/%m/%Y').date()
-            df_filtered = df_filtered[df_filtered['FechaPre'].dt.date >= start_dt]
-        if end_date:
-            end_dt = datetime.strptime(end_date, '%d/%m/%Y').date()
-            df_filtered = df_filtered[df_filtered['FechaPre'].dt.date <= end_dt]
+        # Comparar contra Timestamps (el día final se incluye completo)
+        if start_date or end_date:
+            df_filtered = df_filtered.loc[self._day_range_mask(df_filtered['FechaPre'], start_date, end_date)]
             
         # Crear columnas de agrupación según el período especificado
-        if grouping == TimeGrouping.DAILY:
-            df_filtered['Periodo'] = df_filtered['FechaPre'].dt.date
-        elif grouping == TimeGrouping.WEEKLY:
-            df_filtered['Periodo'] = df_filtered['FechaPre'].dt.strftime('%Y-W%U')
-        elif grouping == TimeGrouping.MONTHLY:
-            df_filtered['Periodo'] = df_filtered['FechaPre'].dt.strftime('%Y-%m')
-        else:  # YEARLY
-            df_filtered['Periodo'] = df_filtered['FechaPre'].dt.year
+        df_filtered = df_filtered.assign(Periodo=self._period_keys(df_filtered['FechaPre'], grouping))
             
-        # Generar el reporte usando pivot_table
-        pivot_report = pd.pivot_table(
-            df_filtered,
-            index='OperadorPre',
-            columns='Periodo',
-            values='NumeroTramite',
-            aggfunc='count',
-            fill_value=0
+        # Generar el reporte: conteo agrupado y unstack (equivale a pivot_table con
+        # aggfunc='count' sin su maquinaria genérica de agregación)
+        pivot_report = (
+            df_filtered.groupby(['OperadorPre', 'Periodo'], observed=True)['NumeroTramite']
+            .count()
+            .unstack(fill_value=0)
         )
         
-        # Renombrar el índice para mostrar "Evaluadores"
+        # Renombrar el índice para mostrar "Evaluadores" y las columnas con la etiqueta del período
         pivot_report.index.name = 'Evaluadores'
+        pivot_report.columns = pd.Index(self._period_labels(pivot_report.columns, grouping), name='Periodo')
         
         # Agregar columna de total
         pivot_report['Total'] = pivot_report.sum(axis=1)
@@ -843,6 +1138,7 @@ class OperatorReport:
         
         return pivot_report
     
+    @_memoize_report
     def get_operator_summary(self, start_date=None, end_date=None):
         """
         Genera un resumen general de la carga de trabajo por operador.
@@ -854,13 +1150,11 @@ class OperatorReport:
         Returns:
             pd.DataFrame: DataFrame con el resumen de trabajo por operador
         """
-        df_filtered = self.df.copy()
-        if start_date:
-            df_filtered = df_filtered[df_filtered['FechaPre'] >= start_date]
-        if end_date:
-            df_filtered = df_filtered[df_filtered['FechaPre'] <= end_date]
+        df_filtered = self.df[['OperadorPre', 'NumeroTramite', 'FechaPre']]
+        if start_date or end_date:
+            df_filtered = df_filtered.loc[self._range_mask(df_filtered['FechaPre'], start_date, end_date)]
             
-        summary = df_filtered.groupby('OperadorPre').agg({
+        summary = df_filtered.groupby('OperadorPre', observed=True).agg({
             'NumeroTramite': 'count',
             'FechaPre': ['min', 'max']
         }).reset_index()
@@ -897,7 +1191,74 @@ class OperatorReport:
                 - variations: Dict con las variaciones entre períodos consecutivos
                 - projections: Dict con proyecciones detalladas incluyendo necesidades de personal
         """
+        # Obtener métricas de carga de trabajo
+        workload_metrics = self.get_workload_metrics(start_date, end_date, grouping)
+        
+        # Calcular productividad promedio por período
+        avg_productivity = workload_metrics['productivity_per_evaluator'].mean()
+        
+        # Calcular variaciones entre períodos consecutivos
+        variations = {
+            'evaluators': workload_metrics['active_evaluators'].diff().fillna(0),
+            'production': workload_metrics['completions'].diff().fillna(0),
+            'productivity': workload_metrics['productivity_per_evaluator'].diff().fillna(0),
+            'backlog': workload_metrics['cumulative_backlog'].diff().fillna(0)
+        }
+        
+        # Calcular proyecciones avanzadas para todos los períodos a la vez
+        backlog = workload_metrics['cumulative_backlog'].to_numpy(dtype=float)
+        incoming = workload_metrics['incoming'].to_numpy(dtype=float)
+        evaluators = workload_metrics['active_evaluators'].to_numpy()
+        productivity = workload_metrics['productivity_per_evaluator'].to_numpy(dtype=float)
+        
+        if avg_productivity > 0:
+            # Calcular evaluadores necesarios para diferentes aspectos
+            evaluators_for_backlog = backlog / (avg_productivity * 30)  # 30 días por mes
+            evaluators_for_incoming = incoming / avg_productivity
+            total_evaluators_needed = evaluators_for_backlog + evaluators_for_incoming
+            
+            # Calcular tiempo estimado para resolver backlog con capacidad actual
+            capacity = productivity * evaluators * 30
+            estimated_months = np.divide(
+                backlog, capacity, out=np.full_like(backlog, np.inf),
+                where=(productivity > 0) & (evaluators > 0)
+            )
+            
+            projections_df = pd.DataFrame({
+                'current_evaluators': evaluators,
+                'current_productivity': productivity,
+                'evaluators_for_backlog': np.round(evaluators_for_backlog, 2),
+                'evaluators_for_incoming': np.round(evaluators_for_incoming, 2),
+                'evaluators_needed_total': np.round(total_evaluators_needed, 2),
+                'estimated_months_to_resolve': np.round(estimated_months, 1),
+                'backlog': workload_metrics['cumulative_backlog'].to_numpy(),
+                'potential_production': np.round(evaluators * avg_productivity, 2),
+                'production_gap': np.round(evaluators * (avg_productivity - productivity), 2)
+            }, index=workload_metrics['Periodo'])
+        else:
+            # Manejar caso donde no hay productividad promedio
+            projections_df = pd.DataFrame({
+                'current_evaluators': evaluators,
+                'current_productivity': productivity,
+                'evaluators_for_backlog': float('inf'),
+                'evaluators_for_incoming': float('inf'),
+                'evaluators_needed_total': float('inf'),
+                'estimated_months_to_resolve': float('inf'),
+                'backlog': workload_metrics['cumulative_backlog'].to_numpy(),
+                'potential_production': 0,
+                'production_gap': 0
+            }, index=workload_metrics['Periodo'])
+        
+        projections = projections_df.to_dict(orient='index')
+        
+        return {
+            'workload_metrics': workload_metrics,
+            'variations': variations,
+            'projections': projections,
+            'avg_productivity': avg_productivity
+        }
 
+    @_memoize_report
     def get_pending_cases(self, start_date=None, end_date=None, grouping=TimeGrouping.MONTHLY):
         """
         Filtra y agrupa los casos pendientes por período.
@@ -925,29 +1286,28 @@ class OperatorReport:
             if missing_columns:
                 raise ValueError(f"Columnas requeridas faltantes: {', '.join(missing_columns)}")
 
-            # 2. Convertir columnas de fecha a datetime
-            date_columns = ['FechaPre', 'FechaExpendiente', 'FechaEtapaAprobacionMasivaFin']
-            df_processed = self.df.copy()
-            for col in date_columns:
-                df_processed[col] = pd.to_datetime(df_processed[col], errors='coerce')
-
-            # 3. Filtrar casos pendientes
-            pending_df = df_processed[
-                df_processed['FechaExpendiente'].isna() | 
-                df_processed['FechaEtapaAprobacionMasivaFin'].isna()
-            ].copy()
-
-            # 4. Aplicar filtros de fecha si se especifican
-            if start_date:
-                start_dt = pd.to_datetime(start_date, format='%d/%m/%Y')
-                pending_df = pending_df[pending_df['FechaPre'] >= start_dt]
-            if end_date:
-                end_dt = pd.to_datetime(end_date, format='%d/%m/%Y')
-                pending_df = pending_df[pending_df['FechaPre'] <= end_dt]
+            # 2. Proyectar columnas requeridas (las fechas ya son datetime64 desde __init__)
+            df_processed = self.df[required_columns]
+
+            # 3. Filtrar casos pendientes (OR directo sobre las máscaras NumPy, sin Series intermedia;
+            # los arrays de isna() pueden ser de solo lectura, así que no se usan como buffer de salida)
+            no_expediente = np.isnat(df_processed['FechaExpendiente'].to_numpy())
+            pending_mask = np.isnat(df_processed['FechaEtapaAprobacionMasivaFin'].to_numpy())
+            np.logical_or(pending_mask, no_expediente, out=pending_mask)
+
+            # 4. Aplicar filtros de fecha si se especifican (en la misma máscara)
+            if start_date or end_date:
+                pending_mask &= self._range_mask(
+                    df_processed['FechaPre'],
+                    pd.to_datetime(start_date, format='%d/%m/%Y') if start_date else None,
+                    pd.to_datetime(end_date, format='%d/%m/%Y') if end_date else None
+                )
+            # Un solo recorte; copia porque a continuación se agregan columnas al resultado
+            pending_df = df_processed.loc[pending_mask].copy()
 
             # 5. Calcular días en espera
             current_date = pd.Timestamp.now()
-            pending_df['waiting_days'] = (current_date - pending_df['FechaPre']).dt.total_seconds() / (24 * 3600)
+            pending_df['waiting_days'] = (current_date - pending_df['FechaPre']) / np.timedelta64(1, 'D')
 
             # 6. Definir la frecuencia de agrupación
             freq_map = {
@@ -958,98 +1318,140 @@ class OperatorReport:
             }
             freq = freq_map[grouping]
 
-            # 7. Agrupar y calcular métricas
-            grouped = pending_df.groupby(pd.Grouper(key='FechaPre', freq=freq)).agg({
-                'NumeroTramite': 'count',  # total_pending
-                'FechaExpendiente': lambda x: x.isna().sum(),  # pending_no_expediente
-                'FechaEtapaAprobacionMasivaFin': lambda x: x.isna().sum(),  # pending_no_aprobacion
-                'waiting_days': 'mean'  # avg_waiting_days
-            }).reset_index()
-
-            # 8. Renombrar columnas
-            grouped.columns = [
-                'Periodo',
-                'total_pending',
-                'pending_no_expediente',
-                'pending_no_aprobacion',
-                'avg_waiting_days'
-            ]
+            # 7. Agrupar y calcular métricas (máscaras precalculadas: solo agregaciones nativas)
+            pending_df['no_expediente'] = pending_df['FechaExpendiente'].isna().astype(np.int32)
+            pending_df['no_aprobacion'] = pending_df['FechaEtapaAprobacionMasivaFin'].isna().astype(np.int32)
+            grouped = pending_df.groupby(pd.Grouper(key='FechaPre', freq=freq)).agg(
+                total_pending=('NumeroTramite', 'count'),
+                pending_no_expediente=('no_expediente', 'sum'),
+                pending_no_aprobacion=('no_aprobacion', 'sum'),
+                avg_waiting_days=('waiting_days', 'mean')
+            ).reset_index()
+
+            # 8. Renombrar columna de período
+            grouped = grouped.rename(columns={'FechaPre': 'Periodo'})
 
             # 9. Redondear días en espera y filtrar grupos sin pendientes
             grouped['avg_waiting_days'] = grouped['avg_waiting_days'].round(1)
+            # Los intervalos de pd.Grouper ya vienen ordenados por fecha
             grouped = grouped[grouped['total_pending'] > 0]
-            grouped = grouped.sort_values('Periodo')
 
             return grouped
 
         except Exception as e:
             raise ValueError(f"Error al procesar casos pendientes: {str(e)}")
-        # Obtener métricas de carga de trabajo
-        workload_metrics = self.get_workload_metrics(start_date, end_date, grouping)
-        
-        # Calcular productividad promedio por período
-        avg_productivity = workload_metrics['productivity_per_evaluator'].mean()
-        
-        # Calcular variaciones entre períodos consecutivos
-        variations = {
-            'evaluators': workload_metrics['active_evaluators'].diff().fillna(0),
-            'production': workload_metrics['completions'].diff().fillna(0),
-            'productivity': workload_metrics['productivity_per_evaluator'].diff().fillna(0),
-            'backlog': workload_metrics['cumulative_backlog'].diff().fillna(0)
-        }
-        
-        # Calcular proyecciones avanzadas
-        projections = {}
-        for _, row in workload_metrics.iterrows():
-            period = row['Periodo']
-            current_backlog = row['cumulative_backlog']
-            current_incoming = row['incoming']
-            current_evaluators = row['active_evaluators']
-            current_productivity = row['productivity_per_evaluator']
-            
-            # Calcular evaluadores necesarios para diferentes aspectos
-            if avg_productivity > 0:
-                evaluators_for_backlog = current_backlog / (avg_productivity * 30)  # 30 días por mes
-                evaluators_for_incoming = current_incoming / avg_productivity
-                total_evaluators_needed = evaluators_for_backlog + evaluators_for_incoming
-                
-                # Calcular tiempo estimado para resolver backlog con capacidad actual
-                if current_productivity > 0 and current_evaluators > 0:
-                    estimated_months = current_backlog / (current_productivity * current_evaluators * 30)
-                else:
-                    estimated_months = float('inf')
-                
-                projections[period] = {
-                    'current_evaluators': current_evaluators,
-                    'current_productivity': current_productivity,
-                    'evaluators_for_backlog': round(evaluators_for_backlog, 2),
-                    'evaluators_for_incoming': round(evaluators_for_incoming, 2),
-                    'evaluators_needed_total': round(total_evaluators_needed, 2),
-                    'estimated_months_to_resolve': round(estimated_months, 1),
-                    'backlog': current_backlog,
-                    'potential_production': round(current_evaluators * avg_productivity, 2),
-                    'production_gap': round(current_evaluators * (avg_productivity - current_productivity), 2)
-                }
-            else:
-                # Manejar caso donde no hay productividad promedio
-                projections[period] = {
-                    'current_evaluators': current_evaluators,
-                    'current_productivity': current_productivity,
-                    'evaluators_for_backlog': float('inf'),
-                    'evaluators_for_incoming': float('inf'),
-                    'evaluators_needed_total': float('inf'),
-                    'estimated_months_to_resolve': float('inf'),
-                    'backlog': current_backlog,
-                    'potential_production': 0,
-                    'production_gap': 0
-                }
-        
-        return {
-            'workload_metrics': workload_metrics,
-            'variations': variations,
-            'projections': projections,
-            'avg_productivity': avg_productivity
-        }
+
+def _leer_encabezado_csv(archivo, skip_rows=3):
+    """Retorna los nombres de columna de un CSV descargado (fila 4 por defecto)."""
+    with open(archivo, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        for _ in range(skip_rows):
+            next(reader, None)
+        return next(reader, [])
+
+def _rutas_cache_parquet(archivo):
+    """Rutas (parquet, firma) de la caché de un CSV descargado en <carpeta>/.cache/."""
+    cache_dir = os.path.join(os.path.dirname(archivo), CONSOLIDATION_CACHE_DIR)
+    base = os.path.join(cache_dir, os.path.basename(archivo))
+    return base + '.parquet', base + '.sig'
+
+def _leer_cache_parquet(archivo, signature):
+    """
+    Retorna (tabla, total de registros) desde la caché Parquet si su firma
+    (versión de la caché, mtime_ns y tamaño del CSV) coincide; None si no existe
+    o está desactualizada.
+    """
+    parquet_path, sig_path = _rutas_cache_parquet(archivo)
+    try:
+        with open(sig_path, 'r', encoding='utf-8') as f:
+            version, mtime_ns, size, total_records = (int(value) for value in f.read().split())
+        if version != CONSOLIDATION_CACHE_VERSION or (mtime_ns, size) != signature:
+            return None
+        return pq.read_table(parquet_path), total_records
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+
+def _guardar_cache_parquet(archivo, signature, table, total_records):
+    """Guarda la tabla filtrada en la caché Parquet; los errores solo omiten la caché."""
+    parquet_path, sig_path = _rutas_cache_parquet(archivo)
+    try:
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        pq.write_table(table, parquet_path + '.tmp')
+        os.replace(parquet_path + '.tmp', parquet_path)
+        # La firma se escribe al final: sin firma válida la caché no se usa
+        with open(sig_path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(f"{CONSOLIDATION_CACHE_VERSION} {signature[0]} {signature[1]} {total_records}")
+        os.replace(sig_path + '.tmp', sig_path)
+    except (OSError, pa.ArrowException):
+        pass
+
+def _omitir_filas_largas(row):
+    """invalid_row_handler de Arrow: omite las filas con campos de más y falla con las cortas."""
+    return 'skip' if row.actual_columns > row.expected_columns else 'error'
+
+def _leer_csv_descargado(archivo, header=None):
+    """
+    Lee un CSV descargado (encabezado en la fila 4) con el lector CSV de Arrow,
+    todas las columnas como texto, conserva solo los trámites que comienzan con
+    'LM' y agrega la columna ARCHIVO_ORIGEN.
+
+    El resultado se guarda en una caché Parquet por archivo; si el CSV no cambió
+    (mismo mtime y tamaño) la siguiente consolidación lo lee desde ahí.
+
+    Args:
+        archivo (str): Ruta del CSV descargado.
+        header (list): Encabezado ya leído del archivo (se lee si no se indica).
+
+    Returns:
+        tuple: (pa.Table filtrada, total de registros leídos)
+    """
+    stat = os.stat(archivo)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _leer_cache_parquet(archivo, signature)
+    if cached is not None:
+        return cached
+
+    if header is None:
+        header = _leer_encabezado_csv(archivo)
+
+    # Arrow omite el BOM UTF-8 por sí mismo; las filas con campos de más se
+    # descartan, como on_bad_lines='skip' de pandas
+    try:
+        table = pacsv.read_csv(
+            archivo,
+            read_options=pacsv.ReadOptions(skip_rows=3, use_threads=True),
+            parse_options=pacsv.ParseOptions(invalid_row_handler=_omitir_filas_largas),
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.string() for col in header},
+                strings_can_be_null=True
+            )
+        )
+    except pa.ArrowInvalid:
+        # Filas con campos de menos: Arrow no puede completarlas, pandas las
+        # conserva con los campos faltantes vacíos
+        df = pd.read_csv(archivo, skiprows=3, encoding='utf-8-sig', on_bad_lines='skip', dtype=str)
+        table = pa.Table.from_pandas(
+            df,
+            schema=pa.schema([(col, pa.string()) for col in df.columns]),
+            preserve_index=False
+        )
+    total_records = table.num_rows
+    table = table.filter(pc.starts_with(table['NumeroTramite'], 'LM'))
+    table = table.append_column(
+        'ARCHIVO_ORIGEN',
+        pa.array([os.path.basename(archivo)] * table.num_rows, type=pa.string())
+    )
+    _guardar_cache_parquet(archivo, signature, table, total_records)
+    return table, total_records
+
+def _ajustar_columnas(table, schema):
+    """Reordena la tabla según el esquema de salida; las columnas ausentes quedan nulas."""
+    present = set(table.column_names)
+    arrays = [
+        table[field.name] if field.name in present else pa.nulls(table.num_rows, type=field.type)
+        for field in schema
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
 
 def consolidar_archivos_descargados(folder, output_file, downloaded_files, progress_callback=None, log_callback=None, error_callback=None, base_progress=80, progress_weight=20):
     """Consolida los archivos CSV descargados, tomando la fila 4 como encabezado.
@@ -1069,50 +1471,96 @@ def consolidar_archivos_descargados(folder, output_file, downloaded_files, progr
             log_callback(f"No hay archivos nuevos para consolidar en {folder}")
         return
 
-    dataframes = []
     total_files = len(downloaded_files)
-    
+    completed_files = 0
+
+    # Encabezados primero (solo la fila 4 de cada archivo) para fijar las columnas de salida:
+    # las del primer archivo, ARCHIVO_ORIGEN y luego las nuevas de los siguientes
+    headers = {}
     for index, archivo in enumerate(downloaded_files):
         try:
-            # Leer CSV con UTF-8-SIG para manejar BOM y caracteres especiales
-            df = pd.read_csv(archivo, skiprows=3, encoding='utf-8-sig', on_bad_lines='skip', dtype=str)
-            if log_callback:
-                log_callback(f"Archivo {os.path.basename(archivo)} leído correctamente")
-            
-            # Filtrar solo registros que comienzan con 'LM'
-            total_records = len(df)
-            df = df[df['NumeroTramite'].str.startswith('LM')]
-            if log_callback:
-                log_callback(f"Records with 'LM' in {os.path.basename(archivo)}: {len(df)} out of {total_records}")
-            
-            # Agregar columna con el nombre del archivo origen
-            df['ARCHIVO_ORIGEN'] = os.path.basename(archivo)
-            dataframes.append(df)
-            if progress_callback:
-                consolidation_progress = base_progress + ((index + 1) / total_files * progress_weight)
-                progress_callback(consolidation_progress)
+            headers[index] = _leer_encabezado_csv(archivo)
         except Exception as e:
+            completed_files += 1
             if error_callback:
                 error_callback(archivo, f"Error al procesar archivo: {str(e)}")
-            continue
+    columns = []
+    for header in headers.values():
+        columns.extend(col for col in header if col not in columns)
+        if 'ARCHIVO_ORIGEN' not in columns:
+            columns.append('ARCHIVO_ORIGEN')
+    schema = pa.schema([(col, pa.string()) for col in columns])
 
-    if not dataframes:
-        if log_callback:
-            log_callback("No se pudo procesar ningún archivo correctamente")
-        return
+    def tablas_en_orden():
+        """Lee los archivos en paralelo y entrega las tablas en el orden de entrada."""
+        nonlocal completed_files
+        order = list(headers)
+        pending = {}
+        position = 0
+        # Arrow libera el GIL al parsear, así que los archivos se leen en paralelo con hilos
+        max_workers = max(1, min(os.cpu_count() or 1, len(order)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="consolidacion") as executor:
+            future_to_task = {
+                executor.submit(_leer_csv_descargado, downloaded_files[index], headers[index]): index
+                for index in order
+            }
+            for future in as_completed(future_to_task):
+                index = future_to_task[future]
+                archivo = downloaded_files[index]
+                completed_files += 1
+                try:
+                    # Lectura, filtro 'LM' y columna de origen en una sola pasada con Arrow
+                    table, total_records = future.result()
+                    if log_callback:
+                        log_callback(f"Archivo {os.path.basename(archivo)} leído correctamente")
+                        log_callback(f"Records with 'LM' in {os.path.basename(archivo)}: {table.num_rows} out of {total_records}")
+                    pending[index] = table
+                except Exception as e:
+                    pending[index] = None
+                    if error_callback:
+                        error_callback(archivo, f"Error al procesar archivo: {str(e)}")
+                if progress_callback:
+                    consolidation_progress = base_progress + (completed_files / total_files * progress_weight)
+                    progress_callback(consolidation_progress)
+
+                # Entregar (y liberar) las tablas consecutivas ya disponibles
+                while position < len(order) and order[position] in pending:
+                    table = pending.pop(order[position])
+                    position += 1
+                    if table is not None:
+                        yield table
 
+    # Escritura incremental: solo se retienen en memoria las tablas que llegan fuera de orden.
+    # Se escribe a un temporal para no perder el consolidado anterior si nada se procesa.
+    temp_output = output_file + '.tmp'
+    total_rows = 0
+    written_files = 0
     try:
-        df_consolidado = pd.concat(dataframes, ignore_index=True)
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df_consolidado.to_csv(output_file, 
-                            index=False,
-                            encoding='utf-8-sig',
-                            quoting=csv.QUOTE_NONNUMERIC,
-                            escapechar='\\',
-                            sep=',')
+        # Escritor CSV de Arrow: textos entre comillas (comillas internas duplicadas), con BOM UTF-8
+        with open(temp_output, 'wb') as f:
+            f.write(b'\xef\xbb\xbf')
+            with pacsv.CSVWriter(f, schema, write_options=pacsv.WriteOptions(quoting_style='needed')) as writer:
+                for table in tablas_en_orden():
+                    writer.write_table(_ajustar_columnas(table, schema))
+                    total_rows += table.num_rows
+                    written_files += 1
+
+        if not written_files:
+            os.remove(temp_output)
+            if log_callback:
+                log_callback("No se pudo procesar ningún archivo correctamente")
+            return
+
+        os.replace(temp_output, output_file)
         if log_callback:
             log_callback(f"Consolidado guardado en: {output_file}")
-            log_callback(f"Total de registros consolidados: {len(df_consolidado):,}")
+            log_callback(f"Total de registros consolidados: {total_rows:,}")
     except Exception as e:
+        if os.path.exists(temp_output):
+            try:
+                os.remove(temp_output)
+            except OSError:
+                pass
         if error_callback:
             error_callback(output_file, f"Error al guardar el consolidado: {str(e)}")
@@ -1,20 +1,558 @@
 import os
 import pandas as pd
-import xlwt
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Tuple
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor
-import gc
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
-from concurrent.futures import ProcessPoolExecutor
 import openpyxl
 from datetime import datetime
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 import xlsxwriter
 import multiprocessing as mp
 from multiprocessing import Pool
-import shutil
+import tempfile
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+try:
+    import python_calamine  # noqa: F401 - lector Rust para .xls/.xlsx (motor 'calamine' de pandas >= 2.2)
+    _PANDAS_HAS_CALAMINE = tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:  # python-calamine es opcional; se usa xlrd
+    _PANDAS_HAS_CALAMINE = False
+
+XLS_ENGINE = 'calamine' if _PANDAS_HAS_CALAMINE else 'xlrd'
+XLSX_ENGINE = 'calamine' if _PANDAS_HAS_CALAMINE else 'openpyxl'
+
+
+def read_legacy_excel(path: str, usecols: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    Read a legacy .xls file with the fastest available engine.
+
+    Args:
+        path: Path to the .xls file
+        usecols: Column positions to load; the rest are skipped by the parser
+
+    Returns:
+        pd.DataFrame: Sheet contents (only the requested columns, in file order)
+    """
+    return pd.read_excel(path, engine=XLS_ENGINE, usecols=usecols)
+
+
+def write_excel_write_only(df: pd.DataFrame, output_path: str, date_columns: Optional[List[str]] = None) -> None:
+    """
+    Write a DataFrame to XLSX with openpyxl's write-only (streaming) workbook.
+
+    Date columns get their 'dd/mm/yyyy' format as each row is appended, so no
+    second pass over the worksheet is needed.
+
+    Args:
+        df: DataFrame to write (header + rows, no index)
+        output_path: Destination .xlsx path
+        date_columns: Columns to format as dates; defaults to columns containing
+            'FECHA' plus any datetime-typed column
+    """
+    if date_columns is None:
+        date_columns = [
+            col for col in df.columns
+            if 'FECHA' in str(col).upper() or pd.api.types.is_datetime64_any_dtype(df[col])
+        ]
+    date_positions = [df.columns.get_loc(col) for col in date_columns]
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append([str(col) for col in df.columns])
+
+    # Missing values (NaN/NaT) are written as empty cells, like pd.ExcelWriter
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        row = list(row)
+        for pos in date_positions:
+            cell = WriteOnlyCell(ws, value=row[pos])
+            cell.number_format = 'dd/mm/yyyy'
+            row[pos] = cell
+        ws.append(row)
+
+    wb.save(output_path)
+
+
+# Tipos inferidos cuyos valores iguales siempre tienen el mismo texto (1 == 1.0 == True
+# o 0.0 == -0.0 no lo cumplen), así que se pueden convertir a texto por valor distinto
+_QUANTIZABLE_INFERRED_TYPES = frozenset({'string', 'integer', 'date', 'datetime'})
+
+
+def _column_strings(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    str(value) per cell of one column, plus the empty-cell mask.
+
+    Low-cardinality columns (fewer distinct values than a quarter of the rows)
+    are quantized like a categorical: each distinct value is stringified once
+    and the cells share those strings, instead of one new string per row.
+
+    Args:
+        values: Column to convert
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Object array of strings and boolean mask
+            of cells with text (not NaN and not '')
+    """
+    raw = values.to_numpy(dtype=object)
+    if pd.api.types.infer_dtype(raw, skipna=True) in _QUANTIZABLE_INFERRED_TYPES:
+        codes, uniques = pd.factorize(raw)
+        if len(uniques) < len(raw) // 4:
+            unique_strings = pd.Series(uniques, dtype=object).astype(str).to_numpy(dtype=object)
+            strings = unique_strings.take(codes) if len(uniques) else np.full(len(raw), '', dtype=object)
+            return strings, (codes >= 0) & (unique_strings != '').take(codes)
+    strings = values.astype(object).astype(str).to_numpy(dtype=object)
+    return strings, values.notna().to_numpy(dtype=bool) & (strings != '')
+
+
+def excel_text_cells(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stringify a DataFrame for xlsxwriter in one columnar pass, measuring the
+    longest text of each column on the same strings used for writing.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Object matrix with str(value) per cell,
+            or None where the cell is empty (NaN or '') so write_row leaves it
+            blank; and max text length per column (0 for columns without text)
+    """
+    cells = np.empty(df.shape, dtype=object)
+    lengths = np.zeros(df.shape[1], dtype=int)
+    for pos in range(df.shape[1]):
+        strings, filled = _column_strings(df.iloc[:, pos])
+        cells[:, pos] = np.where(filled, strings, None)
+        lengths[pos] = max(map(len, strings[filled]), default=0)
+    return cells, lengths
+
+
+def excel_date_column_indices(df: pd.DataFrame) -> frozenset:
+    """
+    Positions of the columns to write with the date format.
+
+    Datetime-typed columns are detected by dtype, so call it before fillna('')
+    turns columns with gaps into object; columns named like 'FECHA' are kept for
+    dates still held as text or objects.
+
+    Args:
+        df: DataFrame about to be written
+
+    Returns:
+        frozenset: Column positions for the date format
+    """
+    return frozenset(
+        col_idx for col_idx, (col_name, dtype) in enumerate(df.dtypes.items())
+        if pd.api.types.is_datetime64_any_dtype(dtype) or 'FECHA' in str(col_name).upper()
+    )
+
+
+# Por debajo de este tamaño el modo en memoria de xlsxwriter es más rápido
+XLSX_CONSTANT_MEMORY_MIN_ROWS = 5000
+
+
+def xlsxwriter_options(total_rows: int) -> dict:
+    """
+    Workbook options for the streaming xlsxwriter writers.
+
+    constant_memory flushes each row to a temp file as soon as the next one
+    starts, so rows must be written strictly in order and anything that
+    affects a row (column formats included) must be set before it is written.
+    It only pays off for large sheets with a fast temp dir, so it is enabled
+    above XLSX_CONSTANT_MEMORY_MIN_ROWS rows and the temp dir comes from the
+    XLSX_TMP environment variable, falling back to the system temp dir.
+
+    xlsxwriter cannot write Excel tables in constant_memory mode, so callers
+    only add the 'BASE' table when the option is off: small sheets get it,
+    large ones are written without it.
+
+    Args:
+        total_rows: Number of data rows that will be written
+
+    Returns:
+        dict: Options for xlsxwriter.Workbook
+    """
+    return {
+        'constant_memory': total_rows > XLSX_CONSTANT_MEMORY_MIN_ROWS,
+        'nan_inf_to_errors': True,
+        'tmpdir': os.environ.get('XLSX_TMP', tempfile.gettempdir()),
+    }
+
+
+def sibling_temp_path(output_path: str) -> str:
+    """
+    Create an empty, uniquely named temp file next to output_path.
+
+    Writing there and finishing with os.replace(temp, output_path) is a single
+    rename on the same filesystem, which also overwrites an existing output on
+    Windows (where shutil.move falls back to copy + delete).
+
+    Args:
+        output_path: Final destination of the file
+
+    Returns:
+        str: Path of the temp file, in the same directory as output_path
+    """
+    root, suffix = os.path.splitext(os.path.basename(output_path))
+    fd, temp_path = tempfile.mkstemp(suffix=suffix, prefix=f'{root}_',
+                                     dir=os.path.dirname(output_path) or '.')
+    os.close(fd)
+    return temp_path
+
+
+def write_excel_constant_memory(df: pd.DataFrame, output_path: str, date_columns: Optional[List[str]] = None) -> None:
+    """
+    Write a DataFrame to XLSX with xlsxwriter in constant_memory mode.
+
+    Each row is flushed to disk as soon as the next one starts, so memory stays
+    bounded by one row however wide or long the frame is. Date columns get the
+    'dd/mm/yyyy' format once as a column format, set before any row is written.
+
+    Args:
+        df: DataFrame to write (header + rows, no index)
+        output_path: Destination .xlsx path
+        date_columns: Columns to format as dates; defaults to columns containing
+            'FECHA' plus any datetime-typed column
+    """
+    if date_columns is None:
+        date_columns = [
+            col for col in df.columns
+            if 'FECHA' in str(col).upper() or pd.api.types.is_datetime64_any_dtype(df[col])
+        ]
+    date_positions = [df.columns.get_loc(col) for col in date_columns]
+
+    workbook = xlsxwriter.Workbook(output_path, {
+        'constant_memory': True,
+        'default_date_format': 'dd/mm/yyyy',
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+    })
+    try:
+        worksheet = workbook.add_worksheet('Sheet1')
+        date_format = workbook.add_format({'num_format': 'dd/mm/yyyy'})
+        header_format = workbook.add_format()
+        # Cells written without a format take the column's, so dates need no per-cell write
+        for pos in date_positions:
+            worksheet.set_column(pos, pos, None, date_format)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns], header_format)
+
+        # Missing values (NaN/NaT/NA) are written as empty cells, like pd.ExcelWriter
+        values = df.astype(object).where(df.notna(), None)
+        for row_idx, row in enumerate(values.itertuples(index=False, name=None), start=1):
+            worksheet.write_row(row_idx, 0, row)
+    finally:
+        workbook.close()
+
+
+def read_csv_arrow(path: str, string_columns: Optional[List[str]] = None,
+                   dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read a CSV with Arrow's multi-threaded parser, keeping text columns as text.
+
+    Numbers are inferred as before, but columns Arrow would turn into dates or
+    timestamps stay as strings (DataFrame.read_csv never parsed them), and
+    empty fields become missing values.
+
+    Args:
+        path: Path to the CSV file
+        string_columns: Columns always read as strings (e.g. codes with leading zeros)
+        dtype_backend: 'pyarrow' to keep the columns Arrow-backed (pd.ArrowDtype)
+
+    Returns:
+        pd.DataFrame: File contents
+    """
+    column_types = {name: pa.string() for name in (string_columns or [])}
+    try:
+        while True:
+            table = pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(use_threads=True),
+                convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True),
+            )
+            temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+            if not temporal:
+                return table.to_pandas(types_mapper=pd.ArrowDtype if dtype_backend == 'pyarrow' else None)
+            column_types.update({name: pa.string() for name in temporal})
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        backend = {'dtype_backend': dtype_backend} if dtype_backend else {}
+        return pd.read_csv(path, low_memory=False, dtype={name: str for name in (string_columns or [])}, **backend)
+
+
+def write_csv_arrow(df: pd.DataFrame, output_path: str) -> None:
+    """
+    Write a DataFrame to CSV with Arrow's C++ writer.
+
+    Datetime columns holding only whole days are written as plain dates, and
+    float columns keep DataFrame.to_csv's number text ('1.0', not Arrow's '1').
+    Quoting differs from to_csv: Arrow quotes the header and every text field,
+    floats included ("1.0"), where to_csv only quotes fields that need it. The
+    file reads back the same with pd.read_csv and read_csv_arrow (quoted numbers
+    are still inferred as numbers), but it is not byte-identical. Frames Arrow
+    cannot convert (mixed-type object columns) fall back to DataFrame.to_csv.
+
+    Args:
+        df: DataFrame to write (header + rows, no index)
+        output_path: Destination .csv path
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df.to_csv(output_path, index=False)
+        return
+
+    for position, col in enumerate(df.columns):
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values) and (values.dropna() == values.dropna().dt.normalize()).all():
+            table = table.set_column(position, table.field(position).name, table.column(position).cast(pa.date32()))
+        elif pd.api.types.is_float_dtype(values):
+            # Mismo texto que to_csv (repr de NumPy); los vacíos siguen vacíos
+            text = values.to_numpy(dtype=float, na_value=np.nan).astype(str)
+            table = table.set_column(position, table.field(position).name,
+                                     pa.array(text, type=pa.string(), mask=values.isna().to_numpy()))
+
+    pacsv.write_csv(table, output_path)
+
+
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')  # Serial 0 de Excel (incluye el bug del 29/02/1900)
+
+
+def to_excel_serial_dates(values: pd.Series) -> Tuple[pd.Series, int]:
+    """
+    Convert a column of dates to Excel serial numbers in vectorized passes.
+
+    Datetime values are used as-is; other values are parsed from their string
+    form: ISO text ('2024-01-05', '2024-01-05 00:00:00', as real dates become
+    in a text-typed column) as year-month-day, the rest first with
+    dayfirst=True and then without it. Values that cannot be parsed (and empty
+    cells) are returned unchanged.
+
+    Args:
+        values: Column to convert
+
+    Returns:
+        Tuple[pd.Series, int]: Converted column and number of converted cells
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values.dt.tz_localize(None) if values.dt.tz is not None else values
+    else:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        objects = values.astype(object)
+        is_datetime = objects.map(lambda value: isinstance(value, (datetime, pd.Timestamp)))
+        if is_datetime.any():
+            parsed[is_datetime] = pd.to_datetime(objects[is_datetime])
+
+        pending = objects.notna() & ~is_datetime
+        if pending.any():
+            texts = objects[pending].astype(str)
+            # Texto ISO (año-mes-día): nunca con dayfirst, que intercambiaría día y mes
+            is_iso = texts.str.match(r'\d{4}-\d{2}-\d{2}')
+            if is_iso.any():
+                converted = pd.to_datetime(texts[is_iso], errors='coerce', format='ISO8601')
+                ok = converted.notna()
+                parsed[converted.index[ok]] = converted[ok]
+                texts = texts.drop(converted.index[ok])
+            # Formato inferido del primer valor (rápido) y luego valor a valor
+            attempts = (
+                {'dayfirst': True},
+                {'dayfirst': True, 'format': 'mixed'},
+                {'format': 'mixed'},
+            )
+            for kwargs in attempts:
+                if texts.empty:
+                    break
+                converted = pd.to_datetime(texts, errors='coerce', **kwargs)
+                ok = converted.notna()
+                parsed[converted.index[ok]] = converted[ok]
+                texts = texts[~ok]
+
+    converted_mask = parsed.notna()
+    serials = (parsed[converted_mask].dt.floor('D') - EXCEL_EPOCH).dt.days
+    if converted_mask.all():
+        return serials, int(converted_mask.sum())
+
+    result = values.astype(object)
+    result[converted_mask] = serials.astype(object)
+    return result, int(converted_mask.sum())
+
+
+def ultra_format_file(file_type: str, progress_callback: Optional[Callable[[str], None]] = None) -> Optional[str]:
+    """
+    Format consolidado_final_{file_type}_personal.xlsx for ultra_threaded_format_files.
+
+    Module-level so it keeps no state from the processor instance; each call
+    only touches the file of its own file_type.
+
+    Args:
+        file_type: 'CCM' or 'PRR'
+        progress_callback: Optional function for progress messages
+
+    Returns:
+        Optional[str]: file_type if the file was formatted, None otherwise
+    """
+    temp_path = None
+    try:
+        file_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_personal.xlsx')
+        if not os.path.exists(file_path):
+            if progress_callback:
+                progress_callback(f"⚠️ Archivo no encontrado: {file_path}")
+            return None
+
+        if progress_callback:
+            progress_callback(f"🚀 ULTRA-formateando {file_type} (versión estable)...")
+
+        # 1. Lectura optimizada
+        df = pd.read_excel(file_path, engine=XLSX_ENGINE)
+
+        # 2. VECTORIZACIÓN EXTREMA pero segura
+        date_columns = ['FechaExpendiente', 'FechaEtapaAprobacionMasivaFin', 'FechaPre', 'FECHA_ASIGNACION']
+        df_processed = df.copy()
+        fechapre_converted = 0
+
+        for col_name in date_columns:
+            if col_name in df_processed.columns:
+                try:
+                    # Columna completa a serial de Excel en una pasada; lo que no es
+                    # fecha queda vacío y la columna resulta numérica (float con NaN)
+                    excel_serial, converted = to_excel_serial_dates(df_processed[col_name])
+                    df_processed[col_name] = pd.to_numeric(excel_serial, errors='coerce')
+
+                    if col_name == 'FechaPre':
+                        fechapre_converted = converted
+
+                except Exception as e:
+                    if progress_callback:
+                        progress_callback(f"Warning: Error en conversión de {col_name}: {str(e)}")
+
+        if progress_callback:
+            progress_callback(f"🔍 {fechapre_converted} celdas de FechaPre convertidas (método estable)")
+
+        # 3. ESCRITURA ULTRA-OPTIMIZADA pero segura
+        temp_path = sibling_temp_path(file_path)
+
+        # Configuración segura de xlsxwriter
+        workbook_options = xlsxwriter_options(len(df_processed))
+        workbook = xlsxwriter.Workbook(temp_path, workbook_options)
+        worksheet = workbook.add_worksheet('BASE')
+
+        # Formatos
+        date_format = workbook.add_format({'num_format': 'dd/mm/yyyy'})
+        number_format = workbook.add_format({'num_format': '#,##0'})
+        header_format = workbook.add_format()
+
+        # 4. LIMPIEZA SEGURA de datos
+        df_processed = df_processed.replace([np.inf, -np.inf], np.nan)
+        df_processed = df_processed.fillna('')
+
+        # 5. Configuración de anchos optimizada y formato de fecha por columna.
+        # Va antes de las filas: en constant_memory cada fila se vuelca al escribirse
+        date_col_indices = frozenset(col_idx for col_idx, col_name in enumerate(df_processed.columns)
+                                     if col_name in date_columns)
+        col_formats = {col_idx: date_format for col_idx in date_col_indices}
+
+        # Texto de todas las celdas en una pasada columnar (None = vacía); los anchos
+        # salen de la columna completa, sin muestreo
+        text_cells, text_lengths = excel_text_cells(df_processed)
+
+        for col_idx, col_name in enumerate(df_processed.columns):
+            if df_processed[col_name].dtype == 'object':
+                optimal_width = min(max(text_lengths[col_idx], len(col_name)) + 2, 45)
+            else:
+                optimal_width = max(12, len(col_name) + 2)
+
+            worksheet.set_column(col_idx, col_idx, optimal_width, col_formats.get(col_idx))
+
+        # 6. Escritura de headers
+        for col_idx, col_name in enumerate(df_processed.columns):
+            worksheet.write(0, col_idx, col_name, header_format)
+
+        # 7. Escritura de datos por chunks medianos (balance velocidad/estabilidad)
+        # Clasificación vectorizada de celdas: texto (None = vacía), fechas con su
+        # valor (toman el formato de la columna) y números finitos con formato numérico
+        cell_values = df_processed.to_numpy(dtype=object)
+        for col_idx in date_col_indices:
+            text_cells[:, col_idx] = np.where(text_cells[:, col_idx] != None,  # noqa: E711
+                                              cell_values[:, col_idx], None)
+
+        # Máscara por columna: las columnas numéricas salen completas de su dtype
+        # y solo las de tipo object se revisan celda por celda
+        is_number = np.zeros(cell_values.shape, dtype=bool)
+        for col_idx, dtype in enumerate(df_processed.dtypes):
+            if col_idx in date_col_indices:
+                continue
+            if pd.api.types.is_numeric_dtype(dtype):
+                is_number[:, col_idx] = True
+            elif dtype == object:
+                is_number[:, col_idx] = np.frompyfunc(
+                    lambda value: isinstance(value, (int, float)), 1, 1)(cell_values[:, col_idx]).astype(bool)
+        if is_number.any():
+            is_number[is_number] = np.isfinite(cell_values[is_number].astype(float))
+
+        # Los números se escriben aparte con su formato
+        text_cells[is_number] = None
+        number_columns = [col_idx for col_idx in range(df_processed.shape[1])
+                          if is_number[:, col_idx].any()]
+
+        chunk_size = 8000
+        total_rows = len(df_processed)
+
+        for start_idx in range(0, total_rows, chunk_size):
+            end_idx = min(start_idx + chunk_size, total_rows)
+            chunk_data = text_cells[start_idx:end_idx].tolist()
+
+            for row_offset, row_data in enumerate(chunk_data):
+                row_idx = start_idx + row_offset + 1
+                worksheet.write_row(row_idx, 0, row_data)
+
+                for col_idx in number_columns:
+                    if is_number[row_idx - 1, col_idx]:
+                        try:
+                            worksheet.write(row_idx, col_idx, cell_values[row_idx - 1, col_idx], number_format)
+                        except Exception as write_error:
+                            # En caso de error, dejar la celda vacía
+                            pass
+
+            # Progreso cada chunk
+            if progress_callback and start_idx % (chunk_size * 3) == 0:
+                progress_pct = (end_idx / total_rows) * 100
+                progress_callback(f"📝 Escribiendo {file_type}: {progress_pct:.1f}%")
+
+        # 8. Tabla (solo sin constant_memory: en ese modo xlsxwriter no la escribe)
+        if not workbook_options['constant_memory']:
+            last_col = xlsxwriter.utility.xl_col_to_name(len(df_processed.columns) - 1)
+            table_range = f'A1:{last_col}{len(df_processed) + 1}'
+
+            worksheet.add_table(table_range, {
+                'name': 'BASE',
+                'style': 'Table Style Medium 2',
+                'first_column': False,
+                'last_column': False,
+                'banded_rows': True,
+                'banded_columns': False,
+                # Encabezados explícitos: sin ellos la tabla los reescribe como Column1, Column2...
+                'columns': [{'header': str(col_name), 'header_format': header_format} for col_name in df_processed.columns],
+            })
+
+        workbook.close()
+
+        # Reemplazar archivo
+        os.replace(temp_path, file_path)
+
+        if progress_callback:
+            progress_callback(f"✅ {file_type} ULTRA-formateado exitosamente (versión estable)!")
+
+        return file_type
+
+    except Exception as e:
+        # Limpiar archivo temporal
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        if progress_callback:
+            progress_callback(f"❌ Error en ULTRA-formateo estable de {file_type}: {str(e)}")
+        return None
 
 
 class ExcelProcessor:
@@ -25,6 +563,22 @@ class ExcelProcessor:
         self.base_dir = base_dir
         self.file_types = ['CCM', 'PRR']
 
+    def _run_for_file_types(self, task: Callable[[str], bool], file_types: List[str]) -> List[str]:
+        """
+        Run an independent per-file task for every file type in parallel.
+        
+        Args:
+            task: Callable receiving a file type and returning True on success
+            file_types: File types to process
+        
+        Returns:
+            List[str]: Successfully processed file types, in the given order
+        """
+        with ThreadPoolExecutor(max_workers=max(1, len(file_types))) as executor:
+            futures = {file_type: executor.submit(task, file_type) for file_type in file_types}
+        
+        return [file_type for file_type, future in futures.items() if future.result()]
+
     def process_file(self, file_type: str, progress_callback: Optional[Callable[[str], None]] = None) -> bool:
         """
         Process a single Excel file of the specified type.
@@ -43,41 +597,34 @@ class ExcelProcessor:
             input_path = os.path.join(self.base_dir, f"{file_type}.xls")
             output_path = os.path.join(self.base_dir, f"{file_type}-PROCESADO.xls")
 
-            # Read the Excel file with xlrd engine
-            df = pd.read_excel(input_path, engine='xlrd')
+            # Read only columns F (TRAMITE), AG (OPERADOR) and AN (FECHA_ASIGNACION)
+            df = read_legacy_excel(input_path, usecols=[5, 32, 39])
 
             if progress_callback:
                 progress_callback(f"Filtering {file_type} data...")
 
-            # Filter rows where column F (TRAMITE) starts with 'LM'
-            df_filtered = df[df.iloc[:, 5].astype(str).str.startswith('LM', na=False)].copy()
+            # Filter rows where column F (TRAMITE) starts with 'LM'; the prefix check
+            # runs in Arrow's string kernel instead of per-row Python str objects
+            lm_mask = (
+                df.iloc[:, 0].astype('string[pyarrow]').str.startswith('LM')
+                .fillna(False).to_numpy(dtype=bool)
+            )
 
-            # Create new DataFrame with TRAMITE, OPERADOR, and FECHA_ASIGNACION columns
-            df_filtered['TRAMITE'] = df_filtered.iloc[:, 5]  # Column F
-            # Standard column mapping for CCM and PRR
-            df_filtered['OPERADOR'] = df_filtered.iloc[:, 32]  # Column AG
-            df_filtered['FECHA_ASIGNACION'] = pd.to_datetime(df_filtered.iloc[:, 39], dayfirst=True)  # Column AN
+            # Select the filtered rows and name columns F, AG and AN in one shot
+            df_processed = df.loc[lm_mask].set_axis(['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION'], axis=1)
             
-            # Format date as dd/mm/yyyy without time component
-            df_filtered['FECHA_ASIGNACION'] = pd.to_datetime(df_filtered['FECHA_ASIGNACION'], dayfirst=True).dt.date
-            df_processed = df_filtered[['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION']]
+            # Parse the date once, as dd/mm/yyyy without time component; a malformed
+            # date leaves an empty cell instead of aborting the whole file
+            df_processed['FECHA_ASIGNACION'] = pd.to_datetime(
+                df_processed['FECHA_ASIGNACION'], dayfirst=True, errors='coerce'
+            ).dt.date
 
             if progress_callback:
                 progress_callback(f"Filtered {len(df_processed)} records with LM TRAMITE. Saving processed {file_type} file...")
 
             # Save the processed DataFrame directly to Excel XLSX format with date formatting
             output_path = os.path.join(self.base_dir, f"{file_type}-PROCESADO.xlsx")
-            with pd.ExcelWriter(output_path, engine='openpyxl', date_format='dd/mm/yyyy', datetime_format='dd/mm/yyyy') as writer:
-                # Ensure date format is consistent
-                df_processed['FECHA_ASIGNACION'] = pd.to_datetime(df_processed['FECHA_ASIGNACION']).dt.date
-                df_processed.to_excel(writer, index=False)
-                
-                # Get the worksheet and set the number format for the date column
-                worksheet = writer.sheets['Sheet1']
-                for idx, col in enumerate(df_processed.columns):
-                    if col == 'FECHA_ASIGNACION':
-                        for cell in worksheet[f"{chr(65 + idx)}2:{chr(65 + idx)}{len(df_processed) + 1}"]:
-                            cell[0].number_format = 'dd/mm/yyyy'
+            write_excel_write_only(df_processed, output_path, date_columns=['FECHA_ASIGNACION'])
 
             if progress_callback:
                 progress_callback(f"Successfully processed {file_type} file")
@@ -105,65 +652,48 @@ class ExcelProcessor:
                 progress_callback(f"Processing {file_type}-CALIDADES file...")
 
             input_path = os.path.join(self.base_dir, f"{file_type}-CALIDADES.xls")
-            output_path = os.path.join(self.base_dir, f"{file_type}-CALIDADES-PROCESADO.xls")
-
-            # Read the Excel file
-            df = pd.read_excel(input_path, engine='xlrd')
+            # Read only columns G (index 0), R (TRAMITE, index 1) and AK (index 2)
+            df = read_legacy_excel(input_path, usecols=[6, 17, 36])
 
             if progress_callback:
                 progress_callback(f"Analyzing rows in {file_type}-CALIDADES...")
 
-            # Lists to store processed data
-            tramites = []
-            valores = []
+            # Column R (TRAMITE), AK and G normalised the same way str(value).strip() did
+            # (NumPy's str cast keeps empty cells as 'nan', like str() did)
+            tramite_values, ak_values, g_values = (
+                pd.Series(df.iloc[:, col].to_numpy(dtype=object).astype(str), index=df.index).str.strip()
+                for col in (1, 2, 0)
+            )
 
-            # Determine TRAMITE column (Column R for CCM and PRR)
-            tramite_col = 17  # Column R for CCM and PRR
-            
-            # Iterate through DataFrame rows
-            idx = 0
-            while idx < len(df):
-                # Get value from appropriate TRAMITE column
-                tramite_value = str(df.iloc[idx, tramite_col]).strip()
-                
-                # Check if the value starts with 'LM'
-                if tramite_value.startswith('LM'):
-                    # Get the value from column AK (index 36)
-                    ak_value = str(df.iloc[idx, 36]).strip()
-                    
-                    if ak_value and ak_value not in ['-', '- ']:
-                        # Use the AK value directly
-                        tramites.append(tramite_value)
-                        valores.append(ak_value)
-                    else:
-                        # Check if we can access the row two rows below
-                        if idx + 2 < len(df):
-                            # Get value from column G (index 6) two rows below
-                            g_value = str(df.iloc[idx + 2, 6]).strip()
-                            tramites.append(tramite_value)
-                            valores.append(g_value)
-                
-                idx += 1
+            # Rows whose TRAMITE starts with 'LM'
+            lm_mask = tramite_values.str.startswith('LM').to_numpy(dtype=bool)
 
-            if progress_callback:
-                progress_callback(f"Found and processed {len(tramites)} LM records from column R (TRAMITE). Saving processed {file_type}-CALIDADES file...")
+            # Use the AK value directly when present, otherwise column G two rows
+            # below; rows without a row two below and no AK value are skipped
+            ak_valid = ((ak_values != '') & ~ak_values.isin(['-', '- '])).to_numpy(dtype=bool)
+            has_g_below = np.arange(len(df)) + 2 < len(df)
+            keep = lm_mask & (ak_valid | has_g_below)
 
-            # Create a new workbook and add a worksheet
-            wb = xlwt.Workbook()
-            ws = wb.add_sheet('Sheet1')
+            g_below = g_values.shift(-2).to_numpy(dtype=object)
+            valores_all = np.where(ak_valid, ak_values.to_numpy(dtype=object), g_below)
 
-            # Write headers
-            headers = ['TRAMITE', 'VALOR']
-            for col, header in enumerate(headers):
-                ws.write(0, col, header)
+            tramites = tramite_values.to_numpy(dtype=object)[keep].tolist()
+            valores = valores_all[keep].tolist()
 
-            # Write data rows
-            for row_idx, (tramite, valor) in enumerate(zip(tramites, valores)):
-                ws.write(row_idx + 1, 0, tramite)
-                ws.write(row_idx + 1, 1, valor if valor else '')  # Ensure empty values are written as empty strings
+            if progress_callback:
+                progress_callback(f"Found and processed {len(tramites)} LM records from column R (TRAMITE). Saving processed {file_type}-CALIDADES file...")
 
-            # Save the workbook
-            wb.save(output_path)
+            # Save as XLSX (like {file_type}-PROCESADO.xlsx): xlsxwriter streams rows
+            # to disk in constant memory instead of xlwt's per-cell BIFF writes
+            output_path = os.path.join(self.base_dir, f"{file_type}-CALIDADES-PROCESADO.xlsx")
+            workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+            try:
+                worksheet = workbook.add_worksheet('Sheet1')
+                worksheet.write_row(0, 0, ['TRAMITE', 'VALOR'])
+                for row_idx, row in enumerate(zip(tramites, valores), start=1):
+                    worksheet.write_row(row_idx, 0, row)  # Empty values stay as empty strings
+            finally:
+                workbook.close()
 
             if progress_callback:
                 progress_callback(f"Successfully processed {file_type}-CALIDADES file with {len(tramites)} records")
@@ -185,11 +715,8 @@ class ExcelProcessor:
         Returns:
             List[str]: List of successfully processed file types
         """
-        successful_files = []
-        
-        for file_type in self.file_types:
-            if self.process_calidades_file(file_type, progress_callback):
-                successful_files.append(file_type)
+        successful_files = self._run_for_file_types(
+            lambda file_type: self.process_calidades_file(file_type, progress_callback), self.file_types)
         
         if progress_callback:
             if successful_files:
@@ -232,69 +759,19 @@ class ExcelProcessor:
                 return
             
             # Read PERSONAL.xlsx and keep all columns
-            df_personal = pd.read_excel(personal_path)
+            df_personal = pd.read_excel(personal_path, engine=XLSX_ENGINE, dtype_backend='pyarrow')
             if progress_callback:
                 progress_callback(f"Loaded PERSONAL.xlsx with {len(df_personal.columns)} columns")
             
+            # Uppercase and index 'APELLIDOS Y NOMBRES' once; every file type probes the same index
+            df_personal_indexed = df_personal.set_index(
+                df_personal['APELLIDOS Y NOMBRES'].str.upper()
+            ).drop(columns='APELLIDOS Y NOMBRES')
+            
             # Process each consolidated file
-            for file_type in ['CCM', 'PRR']:
-                try:
-                    # Read consolidated final file
-                    consolidated_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
-                    if not os.path.exists(consolidated_path):
-                        if progress_callback:
-                            progress_callback(f"Warning: {consolidated_path} not found. Skipping {file_type}.")
-                        continue
-                    
-                    if progress_callback:
-                        progress_callback(f"Processing personnel cross-reference for {file_type}...")
-                    
-                    # Read consolidated file
-                    df_consolidated = pd.read_excel(consolidated_path)
-                    initial_columns = df_consolidated.columns.tolist()
-                    
-                    if progress_callback:
-                        progress_callback(f"Merging {file_type} data with PERSONAL information...")
-                    
-                    # Convert OPERADOR column to uppercase for case-insensitive matching
-                    df_consolidated['OPERADOR'] = df_consolidated['OPERADOR'].str.upper()
-
-                    # Merge with personnel data using 'APELLIDOS Y NOMBRES' column
-                    # Keep all columns from both DataFrames
-                    df_merged = pd.merge(
-                        df_consolidated,
-                        df_personal,
-                        left_on='OPERADOR',
-                        right_on='APELLIDOS Y NOMBRES',
-                        how='left'
-                    )
-                    
-                    # Remove duplicate APELLIDOS Y NOMBRES column if it exists
-                    if 'APELLIDOS Y NOMBRES' in df_merged.columns and 'OPERADOR' in df_merged.columns:
-                        df_merged = df_merged.drop('APELLIDOS Y NOMBRES', axis=1)
-                    
-                    # Save merged result
-                    output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_personal.xlsx')
-                    with pd.ExcelWriter(output_path, engine='openpyxl', date_format='dd/mm/yyyy', datetime_format='dd/mm/yyyy') as writer:
-                        df_merged.to_excel(writer, index=False)
-                        
-                        # Format date columns
-                        worksheet = writer.sheets['Sheet1']
-                        for idx, col in enumerate(df_merged.columns):
-                            if 'FECHA' in col.upper():
-                                for cell in worksheet[f"{chr(65 + idx)}2:{chr(65 + idx)}{len(df_merged) + 1}"]:
-                                    cell[0].number_format = 'dd/mm/yyyy'
-                    
-                    # Log the number of columns added from PERSONAL.xlsx
-                    new_columns = [col for col in df_merged.columns if col not in initial_columns]
-                    if progress_callback:
-                        progress_callback(f"Added {len(new_columns)} columns from PERSONAL.xlsx to {file_type}")
-                        progress_callback(f"Successfully created personnel cross-reference for {file_type}")
-                    
-                except Exception as e:
-                    if progress_callback:
-                        progress_callback(f"Error processing personnel cross-reference for {file_type}: {str(e)}")
-                    continue
+            self._run_for_file_types(
+                lambda file_type: self._process_personnel_cross_file(file_type, df_personal_indexed, progress_callback),
+                ['CCM', 'PRR'])
             
             if progress_callback:
                 progress_callback("Completed personnel cross-reference processing.")
@@ -307,103 +784,8 @@ class ExcelProcessor:
     def _process_regular_cross_files(self, progress_callback: Optional[Callable[[str], None]] = None) -> List[str]:
         """Internal method to handle the regular cross-file processing"""
 
-        successful_files = []
-        
-        for file_type in self.file_types:
-            try:
-                if progress_callback:
-                    progress_callback(f"Processing cross-reference for {file_type}...")
-                
-                # Read consolidated CSV file
-                csv_path = os.path.join('descargas', file_type, f'consolidado_total_{file_type}.csv')
-                if not os.path.exists(csv_path):
-                    if progress_callback:
-                        progress_callback(f"Warning: {csv_path} not found. Skipping {file_type}")
-                    continue
-                
-                df_csv = pd.read_csv(csv_path, low_memory=False, dtype={'8': str, '9': str, '10': str})
-                csv_record_count = len(df_csv)
-                if progress_callback:
-                    progress_callback(f"Initial CSV record count for {file_type}: {csv_record_count}")
-                
-                # Read processed XLSX file
-                xlsx_path = os.path.join(self.base_dir, f'{file_type}-PROCESADO.xlsx')
-                if not os.path.exists(xlsx_path):
-                    if progress_callback:
-                        progress_callback(f"Warning: {xlsx_path} not found. Skipping {file_type}")
-                    continue
-                
-                df_xlsx = pd.read_excel(xlsx_path)
-                # Remove duplicates from XLSX before merging, keeping first occurrence
-                df_xlsx = df_xlsx.drop_duplicates(subset=['TRAMITE'], keep='first')
-                xlsx_record_count = len(df_xlsx)
-                if progress_callback:
-                    progress_callback(f"XLSX record count for {file_type} (after removing duplicates): {xlsx_record_count}")
-                
-                if progress_callback:
-                    progress_callback(f"Merging {file_type} files...")
-                
-                # Merge DataFrames on NumeroTramite and TRAMITE columns
-                df_merged = pd.merge(
-                    df_csv,
-                    df_xlsx[['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION']],
-                    left_on='NumeroTramite',
-                    right_on='TRAMITE',
-                    how='left'
-                )
-                
-                # Check for record count discrepancies
-                merged_record_count = len(df_merged)
-                if merged_record_count != csv_record_count:
-                    if progress_callback:
-                        progress_callback(f"Warning: Record count mismatch in {file_type}:")
-                        progress_callback(f"  - Initial CSV records: {csv_record_count}")
-                        progress_callback(f"  - Final merged records: {merged_record_count}")
-                        
-                        # Analyze discrepancies
-                        if merged_record_count < csv_record_count:
-                            missing_records = csv_record_count - merged_record_count
-                            progress_callback(f"  - {missing_records} records were lost during merge")
-                            # Check for duplicate NumeroTramite in CSV
-                            csv_duplicates = df_csv['NumeroTramite'].duplicated().sum()
-                            if csv_duplicates > 0:
-                                progress_callback(f"  - Found {csv_duplicates} duplicate NumeroTramite entries in CSV")
-                        else:
-                            extra_records = merged_record_count - csv_record_count
-                            progress_callback(f"  - {extra_records} additional records were created during merge")
-                            # Check for duplicate matches
-                            merge_duplicates = df_merged['NumeroTramite'].duplicated().sum()
-                            if merge_duplicates > 0:
-                                progress_callback(f"  - Found {merge_duplicates} duplicate entries after merge")
-                
-                # Remove duplicate TRAMITE column
-                df_merged = df_merged.drop('TRAMITE', axis=1)
-                
-                # Save merged result as XLSX
-                xlsx_output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
-                with pd.ExcelWriter(xlsx_output_path, engine='openpyxl', date_format='dd/mm/yyyy', datetime_format='dd/mm/yyyy') as writer:
-                    df_merged.to_excel(writer, index=False)
-                    
-                    # Get the worksheet and set the number format for date columns
-                    worksheet = writer.sheets['Sheet1']
-                    for idx, col in enumerate(df_merged.columns):
-                        if 'FECHA' in col.upper():
-                            for cell in worksheet[f"{chr(65 + idx)}2:{chr(65 + idx)}{len(df_merged) + 1}"]:
-                                cell[0].number_format = 'dd/mm/yyyy'
-                
-                # Save merged result as CSV
-                csv_output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.csv')
-                df_merged.to_csv(csv_output_path, index=False)
-                
-                if progress_callback:
-                    progress_callback(f"Successfully processed cross-reference for {file_type}")
-                
-                successful_files.append(file_type)
-                
-            except Exception as e:
-                if progress_callback:
-                    progress_callback(f"Error processing cross-reference for {file_type}: {str(e)}")
-                continue
+        successful_files = self._run_for_file_types(
+            lambda file_type: self._process_regular_cross_file(file_type, progress_callback), self.file_types)
         
         if progress_callback:
             if successful_files:
@@ -413,6 +795,144 @@ class ExcelProcessor:
         
         return successful_files
 
+    def _process_personnel_cross_file(self, file_type: str, df_personal_indexed: pd.DataFrame,
+                                      progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+        """Cross-reference one consolidated file with the PERSONAL.xlsx data (indexed by uppercase name)"""
+        try:
+            # Read consolidated final file
+            consolidated_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
+            if not os.path.exists(consolidated_path):
+                if progress_callback:
+                    progress_callback(f"Warning: {consolidated_path} not found. Skipping {file_type}.")
+                return False
+            
+            if progress_callback:
+                progress_callback(f"Processing personnel cross-reference for {file_type}...")
+            
+            # Read consolidated file (every column flows to the output, so no projection)
+            df_consolidated = pd.read_excel(consolidated_path, engine=XLSX_ENGINE, dtype_backend='pyarrow')
+            initial_columns = df_consolidated.columns.tolist()
+            
+            if progress_callback:
+                progress_callback(f"Merging {file_type} data with PERSONAL information...")
+            
+            # Convert OPERADOR column to uppercase for case-insensitive matching
+            df_consolidated['OPERADOR'] = df_consolidated['OPERADOR'].str.upper()
+
+            # Join with personnel data indexed by 'APELLIDOS Y NOMBRES'
+            # Keep all columns from both DataFrames (the name itself is the join key)
+            df_merged = df_consolidated.join(df_personal_indexed, on='OPERADOR', how='left', lsuffix='_x', rsuffix='_y')
+            
+            # Save merged result
+            output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_personal.xlsx')
+            write_excel_constant_memory(df_merged, output_path)
+            
+            # Log the number of columns added from PERSONAL.xlsx
+            new_columns = [col for col in df_merged.columns if col not in initial_columns]
+            if progress_callback:
+                progress_callback(f"Added {len(new_columns)} columns from PERSONAL.xlsx to {file_type}")
+                progress_callback(f"Successfully created personnel cross-reference for {file_type}")
+            
+            return True
+            
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"Error processing personnel cross-reference for {file_type}: {str(e)}")
+            return False
+
+    def _process_regular_cross_file(self, file_type: str, progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+        """Cross-reference one consolidated CSV file with its processed XLSX file"""
+        try:
+            if progress_callback:
+                progress_callback(f"Processing cross-reference for {file_type}...")
+            
+            # Read consolidated CSV file
+            csv_path = os.path.join('descargas', file_type, f'consolidado_total_{file_type}.csv')
+            if not os.path.exists(csv_path):
+                if progress_callback:
+                    progress_callback(f"Warning: {csv_path} not found. Skipping {file_type}")
+                return False
+            
+            df_csv = read_csv_arrow(csv_path, string_columns=['8', '9', '10'], dtype_backend='pyarrow')
+            csv_record_count = len(df_csv)
+            if progress_callback:
+                progress_callback(f"Initial CSV record count for {file_type}: {csv_record_count}")
+            
+            # Read processed XLSX file
+            xlsx_path = os.path.join(self.base_dir, f'{file_type}-PROCESADO.xlsx')
+            if not os.path.exists(xlsx_path):
+                if progress_callback:
+                    progress_callback(f"Warning: {xlsx_path} not found. Skipping {file_type}")
+                return False
+            
+            df_xlsx = pd.read_excel(xlsx_path, engine=XLSX_ENGINE, usecols=['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION'],
+                                    dtype_backend='pyarrow')
+            # Remove duplicates from XLSX before merging, keeping first occurrence
+            df_xlsx = df_xlsx.drop_duplicates(subset=['TRAMITE'], keep='first')
+            xlsx_record_count = len(df_xlsx)
+            if progress_callback:
+                progress_callback(f"XLSX record count for {file_type} (after removing duplicates): {xlsx_record_count}")
+            
+            if progress_callback:
+                progress_callback(f"Merging {file_type} files...")
+            
+            # Merge DataFrames on NumeroTramite and TRAMITE columns. Both keys share
+            # one category set, so the join hashes int codes instead of strings
+            categories = pd.Index(df_csv['NumeroTramite'].dropna().unique()).append(
+                pd.Index(df_xlsx['TRAMITE'].dropna().unique())
+            ).unique()
+            df_xlsx_indexed = df_xlsx.drop(columns='TRAMITE').set_axis(
+                pd.CategoricalIndex(df_xlsx['TRAMITE'], categories=categories, name='TRAMITE')
+            )
+            df_merged = (
+                df_csv.assign(_tramite_key=pd.Categorical(df_csv['NumeroTramite'], categories=categories))
+                .join(df_xlsx_indexed, on='_tramite_key', how='left', lsuffix='_x', rsuffix='_y',
+                      validate='m:1', sort=False)
+                .drop(columns='_tramite_key')
+            )
+            
+            # Check for record count discrepancies
+            merged_record_count = len(df_merged)
+            if merged_record_count != csv_record_count:
+                if progress_callback:
+                    progress_callback(f"Warning: Record count mismatch in {file_type}:")
+                    progress_callback(f"  - Initial CSV records: {csv_record_count}")
+                    progress_callback(f"  - Final merged records: {merged_record_count}")
+                    
+                    # Analyze discrepancies
+                    if merged_record_count < csv_record_count:
+                        missing_records = csv_record_count - merged_record_count
+                        progress_callback(f"  - {missing_records} records were lost during merge")
+                        # Check for duplicate NumeroTramite in CSV
+                        csv_duplicates = df_csv['NumeroTramite'].duplicated().sum()
+                        if csv_duplicates > 0:
+                            progress_callback(f"  - Found {csv_duplicates} duplicate NumeroTramite entries in CSV")
+                    else:
+                        extra_records = merged_record_count - csv_record_count
+                        progress_callback(f"  - {extra_records} additional records were created during merge")
+                        # Check for duplicate matches
+                        merge_duplicates = df_merged['NumeroTramite'].duplicated().sum()
+                        if merge_duplicates > 0:
+                            progress_callback(f"  - Found {merge_duplicates} duplicate entries after merge")
+            
+            # Save merged result as XLSX
+            xlsx_output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
+            write_excel_write_only(df_merged, xlsx_output_path)
+            
+            # Save merged result as CSV
+            csv_output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.csv')
+            write_csv_arrow(df_merged, csv_output_path)
+            
+            if progress_callback:
+                progress_callback(f"Successfully processed cross-reference for {file_type}")
+            
+            return True
+            
+        except Exception as e:
+            if progress_callback:
+                progress_callback(f"Error processing cross-reference for {file_type}: {str(e)}")
+            return False
+
     def process_all_files(self, progress_callback: Optional[Callable[[str], None]] = None) -> List[str]:
         """
         Process all Excel files (CCM, PRR).
@@ -423,11 +943,8 @@ class ExcelProcessor:
         Returns:
             List[str]: List of successfully processed file types
         """
-        successful_files = []
-        
-        for file_type in self.file_types:
-            if self.process_file(file_type, progress_callback):
-                successful_files.append(file_type)
+        successful_files = self._run_for_file_types(
+            lambda file_type: self.process_file(file_type, progress_callback), self.file_types)
         
         if progress_callback:
             if successful_files:
@@ -462,7 +979,7 @@ class ExcelProcessor:
                     progress_callback(f"Formateando archivo {file_type}...")
                 
                 # 1. Leer archivo Excel
-                df = pd.read_excel(file_path)
+                df = pd.read_excel(file_path, engine=XLSX_ENGINE)
                 
                 if progress_callback:
                     progress_callback(f"📊 {file_type}: {len(df.columns)} columnas, {len(df)} filas")
@@ -479,95 +996,46 @@ class ExcelProcessor:
                 
                 for col_name in date_columns:
                     if col_name in df_processed.columns:
-                        def convert_date_value(value):
-                            nonlocal fechapre_converted
-                            try:
-                                # LÓGICA EXACTA del método original
-                                if pd.notna(value):
-                                    if isinstance(value, (datetime, pd.Timestamp)):
-                                        date_value = value
-                                    else:
-                                        # Try parsing string dates (igual que el original)
-                                        try:
-                                            date_value = pd.to_datetime(str(value), dayfirst=True)
-                                        except:
-                                            try:
-                                                date_value = pd.to_datetime(str(value))
-                                            except:
-                                                return value  # Si no puede convertir, devolver original
-                                    
-                                    # Convert to Excel serial number (igual que el original)
-                                    excel_date = date_value.toordinal() - datetime(1900, 1, 1).toordinal() + 2
-                                    
-                                    # Contar conversiones de FechaPre
-                                    if col_name == 'FechaPre':
-                                        fechapre_converted += 1
-                                    
-                                    return excel_date
-                                else:
-                                    return value
-                            except:
-                                return value  # En caso de cualquier error, devolver original
+                        # Conversión vectorizada a número de serie de Excel
+                        df_processed[col_name], converted = to_excel_serial_dates(df_processed[col_name])
                         
-                        # Aplicar conversión vectorizada
-                        df_processed[col_name] = df_processed[col_name].apply(convert_date_value)
+                        # Contar conversiones de FechaPre
+                        if col_name == 'FechaPre':
+                            fechapre_converted = converted
                 
                 if progress_callback:
                     progress_callback(f"🔍 {fechapre_converted} celdas de FechaPre convertidas correctamente")
                 
-                # 4. OPTIMIZACIÓN: Escritura rápida con openpyxl
-                if progress_callback:
-                    progress_callback(f"💾 Escritura optimizada...")
-                
-                wb = openpyxl.Workbook()
-                ws = wb.active
-                
-                # Escribir headers rápidamente
-                for col_idx, col_name in enumerate(df_processed.columns, 1):
-                    ws.cell(row=1, column=col_idx, value=col_name)
-                
-                # OPTIMIZACIÓN: Escribir datos por bloques
-                data_rows = df_processed.values.tolist()
-                for row_idx, row_data in enumerate(data_rows, 2):
-                    for col_idx, value in enumerate(row_data):
-                        ws.cell(row=row_idx, column=col_idx, value=value)
-                
-                # 5. OPTIMIZACIÓN: Aplicar formatos por columnas completas
+                # 4. OPTIMIZACIÓN: Formato por columna resuelto una sola vez
                 if progress_callback:
                     progress_callback(f"🎨 Aplicando formatos...")
                 
-                for col_idx, col_name in enumerate(df_processed.columns, 1):
-                    col_letter = get_column_letter(col_idx)
-                    
+                # Invariantes del libro calculados una sola vez
+                last_row = len(df_processed) + 1
+                column_letters = [get_column_letter(col_idx) for col_idx in range(1, len(df_processed.columns) + 1)]
+                
+                column_formats = {}
+                for col_idx, col_name in enumerate(df_processed.columns):
                     if col_name in date_columns:
-                        # Aplicar formato de fecha a toda la columna
-                        range_str = f"{col_letter}2:{col_letter}{len(df_processed) + 1}"
-                        for cell in ws[range_str]:
-                            if isinstance(cell, tuple):
-                                for c in cell:
-                                    c.number_format = 'dd/mm/yyyy'
-                            else:
-                                cell.number_format = 'dd/mm/yyyy'
-                    elif df_processed[col_name].dtype in ['int64', 'float64', 'int32', 'float32']:
-                        # Aplicar formato numérico
-                        range_str = f"{col_letter}2:{col_letter}{len(df_processed) + 1}"
-                        for cell in ws[range_str]:
-                            if isinstance(cell, tuple):
-                                for c in cell:
-                                    c.number_format = '#,##0'
-                            else:
-                                cell.number_format = '#,##0'
+                        column_formats[col_idx] = 'dd/mm/yyyy'
+                    elif (pd.api.types.is_numeric_dtype(df_processed[col_name])
+                          and not pd.api.types.is_bool_dtype(df_processed[col_name])):
+                        column_formats[col_idx] = '#,##0'
+                
+                # Libro en modo write-only: las filas se vuelcan a disco al agregarlas
+                wb = openpyxl.Workbook(write_only=True)
+                ws = wb.create_sheet('Sheet1')
                 
-                # 6. OPTIMIZACIÓN: Anchos calculados rápidamente
+                # 5. OPTIMIZACIÓN: Anchos calculados rápidamente (antes de escribir filas)
                 if progress_callback:
                     progress_callback(f"📏 Calculando anchos...")
                 
-                for col_idx, col_name in enumerate(df_processed.columns, 1):
-                    col_letter = get_column_letter(col_idx)
-                    
+                for col_letter, col_name in zip(column_letters, df_processed.columns):
                     # Cálculo rápido de ancho
-                    if df_processed[col_name].dtype == 'object':
-                        max_len = df_processed[col_name].astype(str).str.len().max()
+                    column = df_processed[col_name]
+                    if column.dtype == 'object' or pd.api.types.is_string_dtype(column):
+                        # Una sola pasada sobre los valores, sin Series intermedias
+                        max_len = max(map(len, map(str, column.to_numpy(dtype=object))), default=0)
                         header_len = len(str(col_name))
                         optimal_width = min(max(max_len, header_len) + 2, 50)
                     else:
@@ -575,11 +1043,29 @@ class ExcelProcessor:
                     
                     ws.column_dimensions[col_letter].width = optimal_width
                 
+                # 6. OPTIMIZACIÓN: Escritura por filas con ws.append
+                if progress_callback:
+                    progress_callback(f"💾 Escritura optimizada...")
+                
+                headers = [str(col_name) for col_name in df_processed.columns]
+                ws.append(headers)
+                
+                # Celdas vacías (NaN/NaT) se escriben como vacías
+                data_rows = df_processed.astype(object).where(df_processed.notna(), None)
+                formatted_columns = list(column_formats.items())
+                for row_data in data_rows.itertuples(index=False, name=None):
+                    row = list(row_data)
+                    for col_idx, number_format in formatted_columns:
+                        cell = WriteOnlyCell(ws, value=row[col_idx])
+                        cell.number_format = number_format
+                        row[col_idx] = cell
+                    ws.append(row)
+                
                 # 7. Crear tabla
                 if progress_callback:
                     progress_callback(f"📋 Creando tabla...")
                 
-                tab = Table(displayName="BASE", ref=f"A1:{get_column_letter(len(df_processed.columns))}{len(df_processed) + 1}")
+                tab = Table(displayName="BASE", ref=f"A1:{column_letters[-1]}{last_row}")
                 style = TableStyleInfo(
                     name="TableStyleMedium2",
                     showFirstColumn=False,
@@ -588,6 +1074,9 @@ class ExcelProcessor:
                     showColumnStripes=False
                 )
                 tab.tableStyleInfo = style
+                # En write-only no se puede releer la fila de encabezados: nombrar columnas
+                tab.tableColumns = [TableColumn(id=col_id, name=header)
+                                    for col_id, header in enumerate(headers, start=1)]
                 ws.add_table(tab)
                 
                 # 8. Guardar archivo
@@ -596,10 +1085,6 @@ class ExcelProcessor:
                 
                 wb.save(file_path)
                 
-                # Liberación de memoria
-                del df, df_processed, data_rows, wb, ws
-                gc.collect()
-                
                 if progress_callback:
                     progress_callback(f"✅ {file_type} formateado exitosamente y rápido.")
                 
@@ -614,15 +1099,8 @@ class ExcelProcessor:
             if progress_callback:
                 progress_callback(f"🚀 Iniciando formateo optimizado (correcto Y rápido)...")
             
-            # OPTIMIZACIÓN: Procesamiento en paralelo
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                futures = {executor.submit(format_single_file, file_type): file_type 
-                          for file_type in ['CCM', 'PRR']}
-                
-                for future in futures:
-                    result = future.result()
-                    if result:
-                        successful_files.append(result)
+            # OPTIMIZACIÓN: Procesamiento en paralelo (un hilo por tipo de archivo)
+            successful_files = self._run_for_file_types(format_single_file, self.file_types)
             
             if progress_callback:
                 if successful_files:
@@ -661,6 +1139,7 @@ class ExcelProcessor:
         
         def process_single_cross_ultra(file_type):
             """Procesar cruce de un archivo con optimizaciones extremas"""
+            temp_path_base = None
             try:
                 if progress_callback:
                     progress_callback(f"🔄 Procesando cruce ULTRA para {file_type}...")
@@ -674,32 +1153,26 @@ class ExcelProcessor:
                         progress_callback(f"⚠️ Archivos faltantes para {file_type}")
                     return None
                 
-                # Lectura optimizada con chunks y tipos
-                df_csv = pd.read_csv(csv_path, 
-                                   dtype={'8': str, '9': str, '10': str}, 
-                                   low_memory=False)
-                df_xlsx = pd.read_excel(xlsx_path)
+                # Lectura optimizada con el lector multihilo de Arrow y tipos
+                df_csv = read_csv_arrow(csv_path, string_columns=['8', '9', '10'])
+                df_xlsx = pd.read_excel(xlsx_path, engine=XLSX_ENGINE,
+                                        usecols=['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION'])
                 
                 if progress_callback:
                     progress_callback(f"📊 {file_type}: CSV {len(df_csv)} filas, XLSX {len(df_xlsx)} filas")
                 
-                # 2. OPTIMIZACIÓN EXTREMA: Limpiar duplicados vectorialmente
-                df_xlsx_clean = df_xlsx.drop_duplicates(subset=['TRAMITE'], keep='first')
+                # 2. OPTIMIZACIÓN EXTREMA: primera asignación por trámite, indexada por TRAMITE
+                assignments = (df_xlsx[['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION']]
+                               .drop_duplicates(subset=['TRAMITE'], keep='first')
+                               .set_index('TRAMITE'))
                 
-                # 3. MERGE ULTRA-OPTIMIZADO con índices
+                # 3. CRUCE ULTRA-OPTIMIZADO: un map por columna en lugar de un merge
                 if progress_callback:
                     progress_callback(f"🔗 Realizando merge vectorizado para {file_type}...")
                 
-                # Crear índice temporal para merge más rápido
-                df_xlsx_clean.set_index('TRAMITE', inplace=True)
-                
-                # Merge vectorizado
-                df_merged = pd.merge(
-                    df_csv,
-                    df_xlsx_clean[['OPERADOR', 'FECHA_ASIGNACION']],
-                    left_on='NumeroTramite',
-                    right_index=True,
-                    how='left'
+                df_merged = df_csv.assign(
+                    OPERADOR=df_csv['NumeroTramite'].map(assignments['OPERADOR']),
+                    FECHA_ASIGNACION=df_csv['NumeroTramite'].map(assignments['FECHA_ASIGNACION']),
                 )
                 
                 # 4. ESCRITURA ULTRA-RÁPIDA con xlsxwriter
@@ -708,96 +1181,105 @@ class ExcelProcessor:
                 
                 # Archivo base (sin personal)
                 output_path_base = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
-                temp_path_base = output_path_base.replace('.xlsx', '_temp_base.xlsx')
+                temp_path_base = sibling_temp_path(output_path_base)
+                
+                # 5. LIMPIEZA VECTORIZADA de datos
+                df_merged = df_merged.replace([np.inf, -np.inf], np.nan)
+                df_csv_output = df_merged  # Tipos originales para el CSV (vacíos = NaN)
+                
+                # Identificar columnas de fecha por dtype (antes de rellenar vacíos) y nombre
+                date_col_indices = excel_date_column_indices(df_merged)
+                df_merged = df_merged.fillna('')
+                
+                # 6. ESCRITURA MASIVA por chunks
+                # Texto de todas las celdas en una pasada columnar (None = celda vacía)
+                text_cells, text_lengths = excel_text_cells(df_merged)
+                
+                # Anchos automáticos optimizados sobre la columna completa
+                column_widths = []
+                for col_idx in range(len(df_merged.columns)):
+                    col_name = df_merged.columns[col_idx]
+                    if df_merged[col_name].dtype == 'object':
+                        optimal_width = min(max(text_lengths[col_idx], len(col_name)) + 2, 40)
+                    else:
+                        optimal_width = max(12, len(col_name) + 2)
+                    
+                    column_widths.append(optimal_width)
+                
+                # Las fechas conservan su valor original y toman el formato de la columna
+                for col_idx in date_col_indices:
+                    text_cells[:, col_idx] = np.where(text_cells[:, col_idx] != None,  # noqa: E711
+                                                      df_merged.iloc[:, col_idx].to_numpy(dtype=object), None)
+                
+                total_rows = len(df_merged)
                 
                 # Configurar xlsxwriter para velocidad máxima
-                workbook_base = xlsxwriter.Workbook(temp_path_base, {
-                    'constant_memory': True,
-                    'nan_inf_to_errors': True,
-                    'tmpdir': '.',
-                })
+                workbook_options = xlsxwriter_options(total_rows)
+                workbook_base = xlsxwriter.Workbook(temp_path_base, workbook_options)
                 worksheet_base = workbook_base.add_worksheet('BASE')
                 
                 # Formatos pre-definidos
                 date_format = workbook_base.add_format({'num_format': 'dd/mm/yyyy'})
+                header_format = workbook_base.add_format()
                 
-                # 5. LIMPIEZA VECTORIZADA de datos
-                df_merged = df_merged.replace([np.inf, -np.inf], np.nan)
-                df_merged = df_merged.fillna('')
+                # Anchos y formato de fecha por columna antes de las filas:
+                # en constant_memory cada fila se vuelca al escribirse
+                for col_idx, optimal_width in enumerate(column_widths):
+                    col_format = date_format if col_idx in date_col_indices else None
+                    worksheet_base.set_column(col_idx, col_idx, optimal_width, col_format)
                 
-                # 6. ESCRITURA MASIVA por chunks
-                # Headers
+                # Headers (formato general explícito para no heredar el de la columna)
                 for col_idx, col_name in enumerate(df_merged.columns):
-                    worksheet_base.write(0, col_idx, col_name)
-                
-                # Identificar columnas de fecha vectorialmente
-                date_cols = [col for col in df_merged.columns if 'FECHA' in col.upper()]
-                date_col_indices = [df_merged.columns.get_loc(col) for col in date_cols]
+                    worksheet_base.write(0, col_idx, col_name, header_format)
                 
                 # Escritura por chunks ultra-rápida
                 chunk_size = 8000
-                total_rows = len(df_merged)
                 
                 for start_idx in range(0, total_rows, chunk_size):
                     end_idx = min(start_idx + chunk_size, total_rows)
-                    chunk_data = df_merged.iloc[start_idx:end_idx].values
+                    chunk_data = text_cells[start_idx:end_idx].tolist()
                     
                     for row_offset, row_data in enumerate(chunk_data):
-                        row_idx = start_idx + row_offset + 1
-                        
-                        for col_idx, value in enumerate(row_data):
-                            if col_idx in date_col_indices and pd.notna(value) and value != '':
-                                worksheet_base.write(row_idx, col_idx, value, date_format)
-                            else:
-                                safe_value = str(value) if pd.notna(value) and value != '' else ''
-                                worksheet_base.write(row_idx, col_idx, safe_value)
-                
-                # 7. Configurar tabla y anchos automáticamente
-                last_col = xlsxwriter.utility.xl_col_to_name(len(df_merged.columns) - 1)
-                table_range = f'A1:{last_col}{len(df_merged) + 1}'
-                
-                worksheet_base.add_table(table_range, {
-                    'name': 'BASE',
-                    'style': 'Table Style Medium 2',
-                    'first_column': False,
-                    'last_column': False,
-                    'banded_rows': True,
-                    'banded_columns': False,
-                })
-                
-                # Anchos automáticos optimizados
-                for col_idx in range(len(df_merged.columns)):
-                    col_name = df_merged.columns[col_idx]
-                    if df_merged[col_name].dtype == 'object':
-                        sample_data = df_merged[col_name].dropna().astype(str).head(500)
-                        if len(sample_data) > 0:
-                            max_len = sample_data.str.len().max()
-                            optimal_width = min(max(max_len, len(col_name)) + 2, 40)
-                        else:
-                            optimal_width = len(col_name) + 2
-                    else:
-                        optimal_width = max(12, len(col_name) + 2)
-                    
-                    worksheet_base.set_column(col_idx, col_idx, optimal_width)
-                
+                        worksheet_base.write_row(start_idx + row_offset + 1, 0, row_data)
+                
+                # 7. Configurar tabla (solo sin constant_memory: en ese modo xlsxwriter no la escribe)
+                if not workbook_options['constant_memory']:
+                    last_col = xlsxwriter.utility.xl_col_to_name(len(df_merged.columns) - 1)
+                    table_range = f'A1:{last_col}{total_rows + 1}'
+                
+                    worksheet_base.add_table(table_range, {
+                        'name': 'BASE',
+                        'style': 'Table Style Medium 2',
+                        'first_column': False,
+                        'last_column': False,
+                        'banded_rows': True,
+                        'banded_columns': False,
+                        # Encabezados explícitos: sin ellos la tabla los reescribe como Column1, Column2...
+                        'columns': [{'header': str(col_name), 'header_format': header_format} for col_name in df_merged.columns],
+                    })
                 workbook_base.close()
                 
-                # Mover archivo base
-                shutil.move(temp_path_base, output_path_base)
+                # Reemplazar archivo base (rename en el mismo directorio)
+                os.replace(temp_path_base, output_path_base)
+                
+                # Mismo contenido que el xlsx (texto o vacío, fechas con su valor original)
+                # para el cruce con PERSONAL sin volver a leer el archivo desde disco
+                df_written = pd.DataFrame(text_cells, columns=df_merged.columns, dtype=object)
+                for col_idx in date_col_indices:
+                    df_written.isetitem(col_idx, pd.Series(text_cells[:, col_idx], dtype=object).infer_objects())
                 
                 # También guardar CSV para compatibilidad
                 csv_output_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.csv')
-                df_merged.to_csv(csv_output_path, index=False)
+                write_csv_arrow(df_csv_output, csv_output_path)
                 
                 if progress_callback:
                     progress_callback(f"✅ Cruce base completado para {file_type}")
                 
-                return file_type
+                return file_type, df_written
                 
             except Exception as e:
                 # Limpiar archivos temporales
-                temp_path_base = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_temp_base.xlsx')
-                if os.path.exists(temp_path_base):
+                if temp_path_base and os.path.exists(temp_path_base):
                     os.remove(temp_path_base)
                 
                 if progress_callback:
@@ -813,7 +1295,7 @@ class ExcelProcessor:
                 if progress_callback:
                     progress_callback("📊 Cargando y optimizando archivo PERSONAL...")
                 
-                df_personal = pd.read_excel(personal_path, engine='openpyxl')
+                df_personal = pd.read_excel(personal_path, engine=XLSX_ENGINE)
                 # Optimización vectorizada de strings
                 df_personal['APELLIDOS Y NOMBRES'] = df_personal['APELLIDOS Y NOMBRES'].str.upper().str.strip()
                 
@@ -823,129 +1305,117 @@ class ExcelProcessor:
                 if progress_callback:
                     progress_callback("⚠️ Archivo PERSONAL.xlsx no encontrado, solo cruce básico")
             
-            # 2. PASO 2: Procesar cruces básicos en paralelo ultra-rápido
-            if progress_callback:
-                progress_callback("🔥 Iniciando cruces básicos en paralelo...")
-            
-            with ThreadPoolExecutor(max_workers=2) as executor:
-                futures = {executor.submit(process_single_cross_ultra, file_type): file_type 
-                          for file_type in self.file_types}
-                
-                for future in futures:
-                    result = future.result()
-                    if result:
-                        successful_files.append(result)
-            
-            # 3. PASO 3: Cruce con PERSONAL ultra-optimizado (si está disponible)
-            if df_personal is not None and successful_files:
-                if progress_callback:
-                    progress_callback("👥 Iniciando cruce con PERSONAL ultra-optimizado...")
-                
-                def process_personal_cross_ultra(file_type):
-                    """Procesar cruce con personal ultra-optimizado"""
+            if df_personal is not None:
+                # Tabla de búsqueda por nombre limpio (una fila por persona)
+                personal_lookup = (df_personal
+                                   .drop_duplicates(subset=['APELLIDOS Y NOMBRES'], keep='first')
+                                   .set_index('APELLIDOS Y NOMBRES'))
+                
+                def process_personal_cross_ultra(file_type, df_base):
+                    """Procesar cruce con personal ultra-optimizado a partir del cruce base en memoria"""
+                    temp_path_personal = None
                     try:
-                        # Leer archivo base ya creado
-                        base_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
-                        df_base = pd.read_excel(base_path, engine='openpyxl')
-                    
                         if progress_callback:
                             progress_callback(f"👥 Cruzando {file_type} con PERSONAL...")
                         
-                        # MERGE ULTRA-OPTIMIZADO con personal
-                        # Preparar columnas vectorialmente
-                        df_base['OPERADOR_CLEAN'] = df_base['OPERADOR'].str.upper().str.strip()
+                        # LOOKUP ULTRA-OPTIMIZADO con personal: cada operador distinto se
+                        # normaliza y se busca una sola vez; las filas toman el resultado
+                        # por su código (-1 = operador vacío, sin datos de PERSONAL)
+                        operator_codes, operators = pd.factorize(df_base['OPERADOR'])
+                        operators_clean = pd.Series(operators, dtype=object).str.upper().str.strip()
+                        personal_matches = personal_lookup.reindex(operators_clean.to_numpy())
                         
-                        # Merge preservando TODAS las columnas de PERSONAL
-                        df_final = pd.merge(
-                            df_base,
-                            df_personal,
-                            left_on='OPERADOR_CLEAN',
-                            right_on='APELLIDOS Y NOMBRES',
-                            how='left'
-                        )
+                        # Columnas repetidas conservan los sufijos que generaba el merge
+                        overlap = df_base.columns.intersection(personal_lookup.columns)
+                        personal_columns = {
+                            (f'{col}_y' if col in overlap else col):
+                                personal_matches[col].array.take(operator_codes, allow_fill=True)
+                            for col in personal_lookup.columns
+                        }
+                        df_final = pd.concat([
+                            df_base.rename(columns={col: f'{col}_x' for col in overlap}),
+                            pd.DataFrame(personal_columns, index=df_base.index),
+                        ], axis=1)
                         
-                        # Limpiar columnas duplicadas vectorialmente
-                        if 'APELLIDOS Y NOMBRES' in df_final.columns:
-                            df_final = df_final.drop(['APELLIDOS Y NOMBRES', 'OPERADOR_CLEAN'], axis=1)
-                        else:
-                            df_final = df_final.drop('OPERADOR_CLEAN', axis=1)
-                        
-                        # ESCRITURA ULTRA-RÁPIDA con xlsxwriter
+                        # ESCRITURA ULTRA-RÁPIDA
                         output_path_personal = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_personal.xlsx')
-                        temp_path_personal = output_path_personal.replace('.xlsx', '_temp_personal.xlsx')
+                        temp_path_personal = sibling_temp_path(output_path_personal)
                         
-                        workbook_personal = xlsxwriter.Workbook(temp_path_personal, {
-                            'constant_memory': True,
-                            'nan_inf_to_errors': True,
-                            'tmpdir': '.',
-                        })
+                        # Limpieza vectorizada
+                        df_final = df_final.replace([np.inf, -np.inf], np.nan)
+                        
+                        # Identificar columnas de fecha por dtype (antes de rellenar vacíos) y nombre
+                        date_col_indices = excel_date_column_indices(df_final)
+                        df_final = df_final.fillna('')
+                        
+                        # Texto de todas las celdas en una pasada columnar (None = celda vacía)
+                        text_cells, text_lengths = excel_text_cells(df_final)
+                        
+                        # Anchos optimizados sobre la columna completa
+                        column_widths = []
+                        for col_idx in range(len(df_final.columns)):
+                            col_name = df_final.columns[col_idx]
+                            if df_final[col_name].dtype == 'object':
+                                optimal_width = min(max(text_lengths[col_idx], len(col_name)) + 2, 35)
+                            else:
+                                optimal_width = max(10, len(col_name) + 2)
+                            
+                            column_widths.append(optimal_width)
+                        
+                        # Las fechas conservan su valor original y toman el formato de la columna
+                        for col_idx in date_col_indices:
+                            text_cells[:, col_idx] = np.where(text_cells[:, col_idx] != None,  # noqa: E711
+                                                              df_final.iloc[:, col_idx].to_numpy(dtype=object), None)
+                        
+                        total_rows = len(df_final)
+                        
+                        workbook_options = xlsxwriter_options(total_rows)
+                        workbook_personal = xlsxwriter.Workbook(temp_path_personal, workbook_options)
                         worksheet_personal = workbook_personal.add_worksheet('BASE')
                         
                         # Formato de fecha
                         date_format = workbook_personal.add_format({'num_format': 'dd/mm/yyyy'})
+                        header_format = workbook_personal.add_format()
                         
-                        # Limpieza vectorizada
-                        df_final = df_final.replace([np.inf, -np.inf], np.nan)
-                        df_final = df_final.fillna('')
+                        # Anchos y formato de fecha por columna (antes de las filas)
+                        for col_idx, optimal_width in enumerate(column_widths):
+                            col_format = date_format if col_idx in date_col_indices else None
+                            worksheet_personal.set_column(col_idx, col_idx, optimal_width, col_format)
                         
                         # Headers
                         for col_idx, col_name in enumerate(df_final.columns):
-                            worksheet_personal.write(0, col_idx, col_name)
-                        
-                        # Identificar columnas de fecha
-                        date_cols = [col for col in df_final.columns if 'FECHA' in col.upper()]
-                        date_col_indices = [df_final.columns.get_loc(col) for col in date_cols]
+                            worksheet_personal.write(0, col_idx, col_name, header_format)
                         
                         # Escritura por chunks
                         chunk_size = 6000  # Más pequeño por el archivo más grande
-                        total_rows = len(df_final)
                         
                         for start_idx in range(0, total_rows, chunk_size):
                             end_idx = min(start_idx + chunk_size, total_rows)
-                            chunk_data = df_final.iloc[start_idx:end_idx].values
+                            chunk_data = text_cells[start_idx:end_idx].tolist()
                             
                             for row_offset, row_data in enumerate(chunk_data):
-                                row_idx = start_idx + row_offset + 1
-                                
-                                for col_idx, value in enumerate(row_data):
-                                    if col_idx in date_col_indices and pd.notna(value) and value != '':
-                                        worksheet_personal.write(row_idx, col_idx, value, date_format)
-                                    else:
-                                        safe_value = str(value) if pd.notna(value) and value != '' else ''
-                                        worksheet_personal.write(row_idx, col_idx, safe_value)
+                                worksheet_personal.write_row(start_idx + row_offset + 1, 0, row_data)
                         
-                        # Tabla y anchos
-                        last_col = xlsxwriter.utility.xl_col_to_name(len(df_final.columns) - 1)
-                        table_range = f'A1:{last_col}{len(df_final) + 1}'
+                        # Tabla (solo sin constant_memory: en ese modo xlsxwriter no la escribe)
+                        if not workbook_options['constant_memory']:
+                            last_col = xlsxwriter.utility.xl_col_to_name(len(df_final.columns) - 1)
+                            table_range = f'A1:{last_col}{total_rows + 1}'
                         
-                        worksheet_personal.add_table(table_range, {
-                            'name': 'BASE',
-                            'style': 'Table Style Medium 2',
-                            'first_column': False,
-                            'last_column': False,
-                            'banded_rows': True,
-                            'banded_columns': False,
-                        })
-                        
-                        # Anchos optimizados
-                        for col_idx in range(len(df_final.columns)):
-                            col_name = df_final.columns[col_idx]
-                            if df_final[col_name].dtype == 'object':
-                                sample_data = df_final[col_name].dropna().astype(str).head(400)
-                                if len(sample_data) > 0:
-                                    max_len = sample_data.str.len().max()
-                                    optimal_width = min(max(max_len, len(col_name)) + 2, 35)
-                                else:
-                                    optimal_width = len(col_name) + 2
-                            else:
-                                optimal_width = max(10, len(col_name) + 2)
-                            
-                            worksheet_personal.set_column(col_idx, col_idx, optimal_width)
+                            worksheet_personal.add_table(table_range, {
+                                'name': 'BASE',
+                                'style': 'Table Style Medium 2',
+                                'first_column': False,
+                                'last_column': False,
+                                'banded_rows': True,
+                                'banded_columns': False,
+                                # Encabezados explícitos: sin ellos la tabla los reescribe como Column1, Column2...
+                                'columns': [{'header': str(col_name), 'header_format': header_format} for col_name in df_final.columns],
+                            })
                         
                         workbook_personal.close()
                         
-                        # Mover archivo final
-                        shutil.move(temp_path_personal, output_path_personal)
+                        # Reemplazar archivo final (rename en el mismo directorio)
+                        os.replace(temp_path_personal, output_path_personal)
                         
                         if progress_callback:
                             progress_callback(f"✅ Cruce con PERSONAL completado para {file_type}: {len(df_final.columns)} columnas")
@@ -953,21 +1423,51 @@ class ExcelProcessor:
                         return file_type
                     
                     except Exception as e:
-                        temp_path_personal = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_temp_personal.xlsx')
-                        if os.path.exists(temp_path_personal):
+                        if temp_path_personal and os.path.exists(temp_path_personal):
                             os.remove(temp_path_personal)
                         
                         if progress_callback:
                             progress_callback(f"❌ Error en cruce PERSONAL para {file_type}: {str(e)}")
                         return None
                 
-                # Procesar cruce con PERSONAL en paralelo
-                with ThreadPoolExecutor(max_workers=2) as executor:
-                    futures_personal = {executor.submit(process_personal_cross_ultra, file_type): file_type 
-                                      for file_type in successful_files}
-                    
-                    for future in futures_personal:
-                        future.result()  # Esperar completación
+            # 2. PASO 2: Procesar cruces básicos en paralelo ultra-rápido; cada
+            # cruce con PERSONAL se lanza en cuanto su cruce base termina, sin
+            # esperar al resto de tipos
+            if progress_callback:
+                progress_callback("🔥 Iniciando cruces básicos en paralelo...")
+                if df_personal is not None:
+                    progress_callback("👥 Cruce con PERSONAL ultra-optimizado a medida que terminan los cruces base...")
+            
+            completed_files = set()
+            with ThreadPoolExecutor(max_workers=2) as executor, \
+                    ThreadPoolExecutor(max_workers=2) as personal_executor:
+                futures = {executor.submit(process_single_cross_ultra, file_type): file_type 
+                          for file_type in self.file_types}
+                futures_personal = {}
+                
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if progress_callback:
+                            progress_callback(f"❌ Error en cruce ultra para {futures[future]}: {str(e)}")
+                        continue
+                    if result:
+                        file_type, df_written = result
+                        completed_files.add(file_type)
+                        # 3. PASO 3: Cruce con PERSONAL (si está disponible)
+                        if df_personal is not None:
+                            futures_personal[personal_executor.submit(
+                                process_personal_cross_ultra, file_type, df_written)] = file_type
+                
+                for future in as_completed(futures_personal):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        if progress_callback:
+                            progress_callback(f"❌ Error en cruce PERSONAL para {futures_personal[future]}: {str(e)}")
+            
+            successful_files = [ft for ft in self.file_types if ft in completed_files]
             
             # 4. REPORTE FINAL
             elapsed_time = time.time() - start_time
@@ -996,163 +1496,8 @@ class ExcelProcessor:
         Returns:
             List[str]: Lista de archivos procesados exitosamente
         """
-        import pandas as pd
-        import xlsxwriter
-        from datetime import datetime
-
         successful_files = []
         
-        def ultra_format_single_file_safe(file_type):
-            """Formatear archivo con optimizaciones extremas pero estables"""
-            try:
-                file_path = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_personal.xlsx')
-                if not os.path.exists(file_path):
-                    if progress_callback:
-                        progress_callback(f"⚠️ Archivo no encontrado: {file_path}")
-                    return None
-                
-                if progress_callback:
-                    progress_callback(f"🚀 ULTRA-formateando {file_type} (versión estable)...")
-                
-                # 1. Lectura optimizada
-                df = pd.read_excel(file_path, engine='openpyxl')
-                
-                # 2. VECTORIZACIÓN EXTREMA pero segura
-                date_columns = ['FechaExpendiente', 'FechaEtapaAprobacionMasivaFin', 'FechaPre', 'FECHA_ASIGNACION']
-                df_processed = df.copy()
-                fechapre_converted = 0
-                
-                for col_name in date_columns:
-                    if col_name in df_processed.columns:
-                        original_values = df_processed[col_name]
-                        mask_not_null = pd.notna(original_values)
-                        
-                        if mask_not_null.any():
-                            try:
-                                date_series = pd.to_datetime(original_values[mask_not_null], 
-                                                            errors='coerce', 
-                                                            dayfirst=True)
-                                excel_serial = (date_series - pd.Timestamp('1900-01-01')).dt.days + 2
-                                df_processed.loc[mask_not_null, col_name] = excel_serial
-                                
-                                if col_name == 'FechaPre':
-                                    fechapre_converted = excel_serial.notna().sum()
-                                
-                            except Exception as e:
-                                if progress_callback:
-                                    progress_callback(f"Warning: Error en conversión de {col_name}: {str(e)}")
-                
-                if progress_callback:
-                    progress_callback(f"🔍 {fechapre_converted} celdas de FechaPre convertidas (método estable)")
-                
-                # 3. ESCRITURA ULTRA-OPTIMIZADA pero segura
-                temp_path = file_path.replace('.xlsx', '_safe_temp.xlsx')
-                
-                # Configuración segura de xlsxwriter
-                workbook = xlsxwriter.Workbook(temp_path, {
-                    'constant_memory': True,
-                    'nan_inf_to_errors': True,
-                    'tmpdir': '.',
-                })
-                worksheet = workbook.add_worksheet('BASE')
-                
-                # Formatos
-                date_format = workbook.add_format({'num_format': 'dd/mm/yyyy'})
-                number_format = workbook.add_format({'num_format': '#,##0'})
-                
-                # 4. Escritura de headers
-                for col_idx, col_name in enumerate(df_processed.columns):
-                    worksheet.write(0, col_idx, col_name)
-                
-                # 5. LIMPIEZA SEGURA de datos
-                df_processed = df_processed.replace([np.inf, -np.inf], np.nan)
-                df_processed = df_processed.fillna('')
-                
-                # 6. Escritura de datos por chunks medianos (balance velocidad/estabilidad)
-                chunk_size = 8000
-                total_rows = len(df_processed)
-                
-                for start_idx in range(0, total_rows, chunk_size):
-                    end_idx = min(start_idx + chunk_size, total_rows)
-                    chunk_data = df_processed.iloc[start_idx:end_idx].values
-                    
-                    for row_offset, row_data in enumerate(chunk_data):
-                        row_idx = start_idx + row_offset + 1
-                        
-                        for col_idx, value in enumerate(row_data):
-                            col_name = df_processed.columns[col_idx]
-                            
-                            try:
-                                if col_name in date_columns and pd.notna(value) and value != '':
-                                    worksheet.write(row_idx, col_idx, value, date_format)
-                                elif isinstance(value, (int, float)) and col_name not in date_columns:
-                                    if pd.notna(value) and not (np.isinf(value) or np.isnan(value)):
-                                        worksheet.write(row_idx, col_idx, value, number_format)
-                                    else:
-                                        worksheet.write(row_idx, col_idx, '')
-                                else:
-                                    safe_value = str(value) if pd.notna(value) and value != '' else ''
-                                    worksheet.write(row_idx, col_idx, safe_value)
-                            except Exception as write_error:
-                                # En caso de error, escribir como string vacío
-                                worksheet.write(row_idx, col_idx, '')
-                    
-                    # Progreso cada chunk
-                    if progress_callback and start_idx % (chunk_size * 3) == 0:
-                        progress_pct = (end_idx / total_rows) * 100
-                        progress_callback(f"📝 Escribiendo {file_type}: {progress_pct:.1f}%")
-                
-                # 7. Configuración de anchos optimizada
-                for col_idx, col_name in enumerate(df_processed.columns):
-                    if df_processed[col_name].dtype == 'object':
-                        sample_data = df_processed[col_name].dropna().astype(str).head(800)
-                        if len(sample_data) > 0:
-                            max_len = sample_data.str.len().max()
-                            optimal_width = min(max(max_len, len(col_name)) + 2, 45)
-                        else:
-                            optimal_width = len(col_name) + 2
-                    else:
-                        optimal_width = max(12, len(col_name) + 2)
-                    
-                    worksheet.set_column(col_idx, col_idx, optimal_width)
-                
-                # 8. Tabla
-                last_col = xlsxwriter.utility.xl_col_to_name(len(df_processed.columns) - 1)
-                table_range = f'A1:{last_col}{len(df_processed) + 1}'
-                
-                worksheet.add_table(table_range, {
-                    'name': 'BASE',
-                    'style': 'Table Style Medium 2',
-                    'first_column': False,
-                    'last_column': False,
-                    'banded_rows': True,
-                    'banded_columns': False,
-                })
-                
-                workbook.close()
-                
-                # Reemplazar archivo
-                shutil.move(temp_path, file_path)
-                
-                # Limpieza de memoria
-                del df, df_processed, chunk_data
-                gc.collect()
-                
-                if progress_callback:
-                    progress_callback(f"✅ {file_type} ULTRA-formateado exitosamente (versión estable)!")
-                
-                return file_type
-                
-            except Exception as e:
-                # Limpiar archivo temporal
-                temp_path = file_path.replace('.xlsx', '_safe_temp.xlsx')
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                
-                if progress_callback:
-                    progress_callback(f"❌ Error en ULTRA-formateo estable de {file_type}: {str(e)}")
-                return None
-        
         try:
             if progress_callback:
                 progress_callback("🚀 Iniciando ULTRA-formateo ESTABLE...")
@@ -1160,13 +1505,13 @@ class ExcelProcessor:
             
             # Procesamiento threading estable
             with ThreadPoolExecutor(max_workers=2) as executor:
-                futures = {executor.submit(ultra_format_single_file_safe, file_type): file_type 
+                futures = {executor.submit(ultra_format_file, file_type, progress_callback): file_type 
                           for file_type in ['CCM', 'PRR']}
-                
-                for future in futures:
-                    result = future.result()
-                    if result:
-                        successful_files.append(result)
+            
+            for future in futures:
+                result = future.result()
+                if result:
+                    successful_files.append(result)
             
             if progress_callback:
                 if successful_files:
@@ -1200,7 +1545,7 @@ class ExcelProcessor:
                 if progress_callback:
                     progress_callback("📊 Cargando y optimizando archivo PERSONAL...")
                 
-                df_personal = pd.read_excel(personal_path)
+                df_personal = pd.read_excel(personal_path, engine=XLSX_ENGINE)
                 # Optimizar el DataFrame PERSONAL
                 df_personal['APELLIDOS Y NOMBRES'] = df_personal['APELLIDOS Y NOMBRES'].str.upper().str.strip()
                 
@@ -1226,9 +1571,9 @@ class ExcelProcessor:
                         continue
                     
                     # Lectura optimizada con tipos específicos
-                    df_csv = pd.read_csv(csv_path, dtype={'8': str, '9': str, '10': str}, 
-                                       low_memory=False)
-                    df_xlsx = pd.read_excel(xlsx_path)
+                    df_csv = read_csv_arrow(csv_path, string_columns=['8', '9', '10'])
+                    df_xlsx = pd.read_excel(xlsx_path, engine=XLSX_ENGINE,
+                                            usecols=['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION'])
                     
                     # Eliminar duplicados antes del merge (más eficiente)
                     df_xlsx_clean = df_xlsx.drop_duplicates(subset=['TRAMITE'], keep='first')
@@ -1242,31 +1587,17 @@ class ExcelProcessor:
                         df_xlsx_clean[['TRAMITE', 'OPERADOR', 'FECHA_ASIGNACION']],
                         left_on='NumeroTramite',
                         right_on='TRAMITE',
-                        how='left'
+                        how='left',
+                        validate='m:1',
+                        sort=False
                     ).drop('TRAMITE', axis=1)
                     
                     # Guardar archivo consolidado sin personal primero
                     output_path_base = os.path.join('descargas', file_type, f'consolidado_final_{file_type}.xlsx')
                     
-                    with pd.ExcelWriter(output_path_base, engine='openpyxl', 
-                                      date_format='dd/mm/yyyy') as writer:
-                        df_merged.to_excel(writer, index=False)
-                        
-                        # Formateo optimizado solo para columnas de fecha
-                        worksheet = writer.sheets['Sheet1']
-                        date_cols = [col for col in df_merged.columns if 'FECHA' in col.upper()]
-                        
-                        for col_name in date_cols:
-                            col_idx = df_merged.columns.get_loc(col_name) + 1
-                            col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx//26) + chr(64 + col_idx%26)
-                            
-                            # Aplicar formato a toda la columna de una vez
-                            for cell in worksheet[f"{col_letter}2:{col_letter}{len(df_merged) + 1}"]:
-                                if isinstance(cell, tuple):
-                                    for c in cell:
-                                        c.number_format = 'dd/mm/yyyy'
-                                else:
-                                    cell.number_format = 'dd/mm/yyyy'
+                    # Filas en streaming (sin el ExcelFormatter de to_excel); columnas
+                    # FECHA o de tipo fecha con formato dd/mm/yyyy
+                    write_excel_constant_memory(df_merged, output_path_base)
                     
                     # Cruce con PERSONAL si está disponible (paso 2)
                     if df_personal is not None:
@@ -1277,13 +1608,30 @@ class ExcelProcessor:
                         df_merged['OPERADOR_CLEAN'] = df_merged['OPERADOR'].str.upper().str.strip()
                         
                         # Merge con PERSONAL manteniendo TODAS las columnas
-                        df_final = pd.merge(
-                            df_merged,
-                            df_personal,
-                            left_on='OPERADOR_CLEAN',
-                            right_on='APELLIDOS Y NOMBRES',
-                            how='left'
-                        )
+                        # (cada persona aparece una sola vez en PERSONAL)
+                        try:
+                            df_final = pd.merge(
+                                df_merged,
+                                df_personal,
+                                left_on='OPERADOR_CLEAN',
+                                right_on='APELLIDOS Y NOMBRES',
+                                how='left',
+                                validate='m:1',
+                                sort=False
+                            )
+                        except pd.errors.MergeError:
+                            # Nombres repetidos: se usa el primer registro de cada persona
+                            if progress_callback:
+                                progress_callback(f"⚠️ Nombres repetidos en PERSONAL, se usa el primer registro para {file_type}")
+                            df_final = pd.merge(
+                                df_merged,
+                                df_personal.drop_duplicates(subset=['APELLIDOS Y NOMBRES'], keep='first'),
+                                left_on='OPERADOR_CLEAN',
+                                right_on='APELLIDOS Y NOMBRES',
+                                how='left',
+                                validate='m:1',
+                                sort=False
+                            )
                         
                         # Limpiar columnas duplicadas
                         if 'APELLIDOS Y NOMBRES' in df_final.columns and 'OPERADOR' in df_final.columns:
@@ -1294,18 +1642,8 @@ class ExcelProcessor:
                         # Guardar archivo consolidado CON personal
                         output_path_personal = os.path.join('descargas', file_type, f'consolidado_final_{file_type}_personal.xlsx')
                         
-                        with pd.ExcelWriter(output_path_personal, engine='openpyxl', 
-                                          date_format='dd/mm/yyyy') as writer:
-                            df_final.to_excel(writer, index=False)
-                            
-                            # Formateo optimizado solo para columnas de fecha
-                            worksheet = writer.sheets['Sheet1']
-                            date_cols = [col for col in df_final.columns if 'FECHA' in col.upper()]
-                            
-                            for col_name in date_cols:
-                                col_idx = df_final.columns.get_loc(col_name) + 1
-                                col_letter = chr(64 + col_idx) if col_idx <= 26 else chr(64 + col_idx//26) + chr(65 + col_idx%26)
-                                
+                        write_excel_constant_memory(df_final, output_path_personal)
+                    
                     successful_files.append(file_type)
                     
                 except Exception as e:
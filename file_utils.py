@@ -53,9 +53,16 @@ def analyze_files(urls_por_partes: Dict[str, List[Tuple[str, str]]], folders: Di
         existing_files = []
         missing_files = []
         
+        # Listar la carpeta una sola vez en lugar de un os.path.exists por archivo
+        try:
+            with os.scandir(folder or '.') as entries:
+                existing_names = {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            existing_names = set()
+        
         for _, filename in urls:
             file_path = os.path.join(folder, filename)
-            if os.path.exists(file_path):
+            if filename in existing_names:
                 existing_files.append(file_path)
             else:
                 missing_files.append(file_path)
@@ -25,7 +25,7 @@ def run_pre_startup_validation():
         # Configurar variables de entorno solo después de una validación exitosa
         os.environ.setdefault('DOWNLOAD_MAX_WORKERS', '7')
         os.environ.setdefault('DOWNLOAD_DELAY', '1')
-        os.environ.setdefault('CHUNK_SIZE', '8192')
+        os.environ.setdefault('CHUNK_SIZE', '65536')
         os.environ.setdefault('DIRECT_DOWNLOAD', 'true')
         
         # Cargar configuración de módulos desde variables de entorno
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+import pandas as pd
+
+from excel_processor import EXCEL_EPOCH, to_excel_serial_dates
+
+
+def _as_dates(serials):
+    return [EXCEL_EPOCH + pd.Timedelta(days=int(value)) for value in serials]
+
+
+def test_mixed_text_and_real_dates_keep_day_and_month():
+    # Columna FechaPre de un libro ya formateado a medias: texto dd/mm/yyyy y fechas reales
+    values = pd.Series(['15/03/2024', datetime(2024, 1, 5)], dtype=object)
+
+    serials, converted = to_excel_serial_dates(values)
+
+    assert converted == 2
+    assert _as_dates(serials) == [pd.Timestamp(2024, 3, 15), pd.Timestamp(2024, 1, 5)]
+
+
+def test_iso_text_is_not_read_dayfirst():
+    # Así llegan las fechas reales en una columna leída como texto (p. ej. string[pyarrow])
+    values = pd.Series(['15/03/2024', '2024-01-05 00:00:00'], dtype='string[pyarrow]')
+
+    serials, converted = to_excel_serial_dates(values)
+
+    assert converted == 2
+    assert _as_dates(serials) == [pd.Timestamp(2024, 3, 15), pd.Timestamp(2024, 1, 5)]